@@ -1,10 +1,15 @@
 import io
+import re
+import heapq
 import logging
 import asyncio
+import time
 import traceback
 import html
 import json
+import functools
 from datetime import datetime
+from collections import OrderedDict
 
 import telegram
 from telegram import (
@@ -28,6 +33,8 @@ from telegram.constants import ParseMode, ChatAction
 
 import config
 import database
+import concurrency
+from concurrency import UserAdmission
 
 import base64
 from ddgs import DDGS
@@ -54,9 +61,42 @@ except ImportError as e:
     INDRA_AVAILABLE = False
     logger.warning(f"INDRA agent not available: {e}")
 
-user_semaphores = {}
+# per-user admission slots, kept in LRU order and bounded by config.n_max_user_semaphores
+user_admissions = OrderedDict()
 user_tasks = {}
 
+# bot-wide cap on in-flight INDRA requests (per-user serialization is done by user_admissions)
+indra_semaphore = asyncio.Semaphore(config.n_max_concurrent_indra_requests)
+
+
+def get_user_admission(user_id: int) -> UserAdmission:
+    return concurrency.get_user_admission(user_admissions, user_id, config.n_max_user_semaphores)
+
+
+# last_interaction bumps are not needed durably per request; they are queued and
+# flushed in bulk by concurrency.last_interaction_worker (started in post_init)
+LAST_INTERACTION_FLUSH_INTERVAL = 0.1  # seconds
+last_interaction_queue = asyncio.Queue()
+last_interaction_task = None
+
+
+def touch_last_interaction(user_id: int):
+    last_interaction_queue.put_nowait((user_id, time.time()))
+
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking Database call in a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+# bot identity, cached once in post_init
+BOT_USERNAME = None
+BOT_ID = None
+
+# compiled @botname patterns, keyed by bot username
+_MENTION_RE_CACHE: dict[str, re.Pattern] = {}
+_WS_RE = re.compile(r'\s+')
+
 # Initialize INDRA client (singleton, reused across requests)
 indra_client = None
 if INDRA_AVAILABLE:
@@ -67,6 +107,9 @@ if INDRA_AVAILABLE:
         logger.error(f"Failed to initialize INDRA client: {e}")
         INDRA_AVAILABLE = False
 
+# constant reply while INDRA/Bedrock is down
+INDRA_UNAVAILABLE_MESSAGE = "❌ The bot is currently unavailable. AWS Bedrock integration is not initialized."
+
 HELP_MESSAGE = """Commands:
 ⚪ /retry – Regenerate last bot answer
 ⚪ /new – Start new dialog
@@ -92,17 +135,61 @@ For example: "{bot_username} write a poem about Telegram"
 """
 
 
+# Health/biomarker keywords
+HEALTH_KEYWORDS = (
+    'biomarker', 'crp', 'il-6', 'inflammation', 'oxidative stress',
+    'pollution', 'pm2.5', 'air quality', 'exposure',
+    'gene', 'genetic', 'variant', 'gstm1',
+    'health', 'risk', 'causal', 'pathway', 'mechanism',
+    'environmental', 'affect', 'impact', 'influence',
+    'molecular', 'protein', 'cytokine'
+)
+_HEALTH_KEYWORDS_RE = re.compile("|".join(map(re.escape, HEALTH_KEYWORDS)), re.IGNORECASE)
+
+
 def split_text_into_chunks(text, chunk_size):
     for i in range(0, len(text), chunk_size):
         yield text[i:i + chunk_size]
 
 
+def _ends_inside_markup(text):
+    # an unclosed <tag or &entity at the end of text
+    return text.rfind("<") > text.rfind(">") or text.rfind("&") > text.rfind(";")
+
+
+def split_html_into_chunks(text, chunk_size):
+    """Split HTML text at line breaks (or spaces) so no chunk cuts a tag or entity in half."""
+    while len(text) > chunk_size:
+        window = text[:chunk_size]
+        for sep in ("\n", " "):
+            cut = window.rfind(sep) + 1
+            while cut and _ends_inside_markup(window[:cut]):
+                cut = window.rfind(sep, 0, cut - 1) + 1
+            if cut:
+                break
+        else:
+            # one unbroken run: cut before the unfinished tag or entity, if any
+            cut = max(window.rfind("<"), window.rfind("&")) if _ends_inside_markup(window) else 0
+            if cut <= 0:
+                cut = chunk_size
+
+        yield text[:cut]
+        text = text[cut:]
+
+    if text:
+        yield text
+
+
+def _search_web_blocking(query: str, max_results: int):
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, max_results=max_results))
+
+
 async def search_web(query: str, max_results: int = 5):
     results = []
     try:
-        with DDGS() as ddgs:
-            for r in ddgs.text(query, max_results=max_results):
-                results.append(r)
+        # ddgs is synchronous, keep its HTTP round-trip off the event loop
+        results = await asyncio.to_thread(_search_web_blocking, query, max_results)
     except Exception as e:
         logger.error(f"Search error: {e}")
     return results
@@ -117,20 +204,8 @@ def is_health_query(message_text: str) -> bool:
     if not message_text:
         return False
 
-    message_lower = message_text.lower()
-
-    # Health/biomarker keywords
-    health_keywords = [
-        'biomarker', 'crp', 'il-6', 'inflammation', 'oxidative stress',
-        'pollution', 'pm2.5', 'air quality', 'exposure',
-        'gene', 'genetic', 'variant', 'gstm1',
-        'health', 'risk', 'causal', 'pathway', 'mechanism',
-        'environmental', 'affect', 'impact', 'influence',
-        'molecular', 'protein', 'cytokine'
-    ]
-
-    # Check if message contains health keywords
-    return any(keyword in message_lower for keyword in health_keywords)
+    # Check if message contains health keywords (single scan for all keywords)
+    return _HEALTH_KEYWORDS_RE.search(message_text) is not None
 
 
 async def query_indra_health_system(user_id: int, message_text: str) -> dict:
@@ -154,11 +229,15 @@ async def query_indra_health_system(user_id: int, message_text: str) -> dict:
         import uuid
 
         # Build user context from database
+        health_attributes = await run_db(
+            db.get_user_attributes,
+            user_id, ['health_genetics', 'health_biomarkers', 'health_location_history']
+        )
         user_context_dict = {
             'user_id': str(user_id),
-            'genetics': db.get_user_attribute(user_id, 'health_genetics') or {},
-            'current_biomarkers': db.get_user_attribute(user_id, 'health_biomarkers') or {},
-            'location_history': db.get_user_attribute(user_id, 'health_location_history') or []
+            'genetics': health_attributes['health_genetics'] or {},
+            'current_biomarkers': health_attributes['health_biomarkers'] or {},
+            'location_history': health_attributes['health_location_history'] or []
         }
 
         user_context = UserContext(**user_context_dict)
@@ -172,8 +251,9 @@ async def query_indra_health_system(user_id: int, message_text: str) -> dict:
         )
 
         # Call INDRA agent directly (no HTTP)
-        logger.info(f"Calling INDRA agent for user {user_id}: {message_text}")
-        response = await indra_client.process_request(request)
+        logger.info("Calling INDRA agent for user %s: %s", user_id, message_text)
+        async with indra_semaphore:
+            response = await indra_client.process_request(request)
 
         # Format response for Telegram
         if hasattr(response, 'causal_graph'):
@@ -193,7 +273,7 @@ async def query_indra_health_system(user_id: int, message_text: str) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error querying INDRA system: {e}", exc_info=True)
+        logger.error("Error querying INDRA system: %s", e, exc_info=True)
         return {
             'success': False,
             'response': f"Health system error: {str(e)}. Using general AI instead.",
@@ -201,6 +281,16 @@ async def query_indra_health_system(user_id: int, message_text: str) -> dict:
         }
 
 
+_REPORT_HEADER = "🧬 <b>Health Intelligence Report</b>\n"
+_REPORT_FOOTER = "💡 <i>This analysis uses INDRA bio-ontology for evidence-based causal pathways.</i>"
+_REL_SYMBOLS = {
+    'activates': '➡️',
+    'inhibits': '⊣',
+    'increases': '⬆️',
+    'decreases': '⬇️'
+}
+
+
 def format_indra_response(response) -> str:
     """Format INDRA causal discovery response for Telegram display.
 
@@ -215,7 +305,7 @@ def format_indra_response(response) -> str:
     explanations = response.explanations
 
     # Build formatted message
-    lines = ["🧬 <b>Health Intelligence Report</b>\n"]
+    lines = [_REPORT_HEADER]
 
     # Explanations (key insights)
     lines.append("📊 <b>Key Insights:</b>")
@@ -234,28 +324,22 @@ def format_indra_response(response) -> str:
     # Show top causal paths (most significant edges)
     if graph.edges:
         lines.append("🔗 <b>Top Causal Pathways:</b>")
-        # Sort by evidence count
-        sorted_edges = sorted(graph.edges,
-                             key=lambda e: e.evidence.count,
-                             reverse=True)[:5]
+        # Top 5 by evidence count
+        top_edges = heapq.nlargest(5, graph.edges, key=lambda e: e.evidence.count)
+        id_to_label = {n.id: n.label for n in graph.nodes}
 
-        for edge in sorted_edges:
+        for edge in top_edges:
             # Find node labels
-            source_label = next((n.label for n in graph.nodes if n.id == edge.source), edge.source)
-            target_label = next((n.label for n in graph.nodes if n.id == edge.target), edge.target)
+            source_label = id_to_label.get(edge.source, edge.source)
+            target_label = id_to_label.get(edge.target, edge.target)
 
-            relationship_symbol = {
-                'activates': '➡️',
-                'inhibits': '⊣',
-                'increases': '⬆️',
-                'decreases': '⬇️'
-            }.get(edge.relationship, '→')
+            relationship_symbol = _REL_SYMBOLS.get(edge.relationship, '→')
 
             lines.append(
-                f"  {source_label} {relationship_symbol} {target_label}\n"
-                f"  <i>Evidence: {edge.evidence.count} papers, "
-                f"Effect: {edge.effect_size:.2f}, "
-                f"Lag: {edge.temporal_lag_hours}h</i>"
+                "  %s %s %s\n  <i>Evidence: %d papers, Effect: %.2f, Lag: %sh</i>" % (
+                    source_label, relationship_symbol, target_label,
+                    edge.evidence.count, edge.effect_size, edge.temporal_lag_hours
+                )
             )
         lines.append("")
 
@@ -267,7 +351,7 @@ def format_indra_response(response) -> str:
             lines.append(f"  {effect_emoji} {modifier.variant}: {modifier.effect_type} effect by {modifier.magnitude:.1f}x")
         lines.append("")
 
-    lines.append("💡 <i>This analysis uses INDRA bio-ontology for evidence-based causal pathways.</i>")
+    lines.append(_REPORT_FOOTER)
 
     return "\n".join(lines)
 
@@ -278,7 +362,14 @@ async def optimize_search_query(user_query: str) -> str:
 
 
 async def register_user_if_not_exists(update: Update, context: CallbackContext, user: User):
-    if not db.check_if_user_exists(user.id):
+    await run_db(_register_user_if_not_exists, update, user)
+    get_user_admission(user.id)
+
+
+def _register_user_if_not_exists(update: Update, user: User):
+    user_doc = db.get_user(user.id)
+
+    if user_doc is None:
         db.add_new_user(
             user.id,
             update.message.chat_id,
@@ -287,37 +378,42 @@ async def register_user_if_not_exists(update: Update, context: CallbackContext,
             last_name= user.last_name
         )
         db.start_new_dialog(user.id)
+    else:
+        updates = {}
+
+        if user_doc.get("current_dialog_id") is None:
+            db.start_new_dialog(user.id)
+
+        if user_doc.get("current_model") is None:
+            updates["current_model"] = config.models["available_text_models"][0]
+
+        # one-time migration of legacy user documents
+        if user_doc.get("schema_version", 0) < database.USER_SCHEMA_VERSION:
+            # back compatibility for n_used_tokens field
+            n_used_tokens = user_doc.get("n_used_tokens")
+            if isinstance(n_used_tokens, (int, float)):  # old format
+                updates["n_used_tokens"] = {
+                    config.models["available_text_models"][0]: {
+                        "n_input_tokens": 0,
+                        "n_output_tokens": n_used_tokens
+                    }
+                }
 
-    if db.get_user_attribute(user.id, "current_dialog_id") is None:
-        db.start_new_dialog(user.id)
-
-    if user.id not in user_semaphores:
-        user_semaphores[user.id] = asyncio.Semaphore(1)
+            # voice message transcription
+            if user_doc.get("n_transcribed_seconds") is None:
+                updates["n_transcribed_seconds"] = 0.0
 
-    if db.get_user_attribute(user.id, "current_model") is None:
-        db.set_user_attribute(user.id, "current_model", config.models["available_text_models"][0])
+            # image generation
+            if user_doc.get("n_generated_images") is None:
+                updates["n_generated_images"] = 0
 
-    # back compatibility for n_used_tokens field
-    n_used_tokens = db.get_user_attribute(user.id, "n_used_tokens")
-    if isinstance(n_used_tokens, int) or isinstance(n_used_tokens, float):  # old format
-        new_n_used_tokens = {
-            config.models["available_text_models"][0]: {
-                "n_input_tokens": 0,
-                "n_output_tokens": n_used_tokens
-            }
-        }
-        db.set_user_attribute(user.id, "n_used_tokens", new_n_used_tokens)
-
-    # voice message transcription
-    if db.get_user_attribute(user.id, "n_transcribed_seconds") is None:
-        db.set_user_attribute(user.id, "n_transcribed_seconds", 0.0)
+            updates["schema_version"] = database.USER_SCHEMA_VERSION
 
-    # image generation
-    if db.get_user_attribute(user.id, "n_generated_images") is None:
-        db.set_user_attribute(user.id, "n_generated_images", 0)
+        if updates:
+            db.set_user_attributes(user.id, updates)
 
 
-async def is_bot_mentioned(update: Update, context: CallbackContext):
+def is_bot_mentioned(update: Update, context: CallbackContext):
     """
     Enhanced function to check if the bot is mentioned in a group chat.
     Returns True for private chats, or if bot is mentioned/replied to in groups.
@@ -331,26 +427,32 @@ async def is_bot_mentioned(update: Update, context: CallbackContext):
         if message.chat.type == "private":
             return True
 
-        bot_username = context.bot.username
+        bot_username = BOT_USERNAME or context.bot.username
         if not bot_username:
             logger.warning("Bot username not available for mention detection")
             return True  # Default to responding if we can't check
 
+        mention_token = "@" + bot_username
+
         # Check for @botname mentions in message text
         message_text = message.text or ""
-        if message_text and f"@{bot_username}" in message_text:
+        if message_text and mention_token in message_text:
             return True
 
         # Check for @botname mentions in caption (for photos/videos/documents)
         caption_text = message.caption or ""
-        if caption_text and f"@{bot_username}" in caption_text:
+        if caption_text and mention_token in caption_text:
             return True
 
         # Check if replying to bot's message
         if message.reply_to_message and message.reply_to_message.from_user:
-            if message.reply_to_message.from_user.id == context.bot.id:
+            if message.reply_to_message.from_user.id == (BOT_ID or context.bot.id):
                 return True
 
+        # No '@' anywhere means no mention entity can match
+        if "@" not in message_text and "@" not in caption_text:
+            return False
+
         # Check message entities for mentions (more robust detection)
         if message.entities:
             for entity in message.entities:
@@ -359,7 +461,7 @@ async def is_bot_mentioned(update: Update, context: CallbackContext):
                     start = entity.offset
                     end = entity.offset + entity.length
                     mentioned_user = message_text[start:end]
-                    if mentioned_user == f"@{bot_username}":
+                    if mentioned_user == mention_token:
                         return True
 
         # Check caption entities for mentions
@@ -370,16 +472,16 @@ async def is_bot_mentioned(update: Update, context: CallbackContext):
                     start = entity.offset
                     end = entity.offset + entity.length
                     mentioned_user = caption_text[start:end]
-                    if mentioned_user == f"@{bot_username}":
+                    if mentioned_user == mention_token:
                         return True
 
         return False
 
     except AttributeError as e:
-        logger.error(f"AttributeError in is_bot_mentioned: {e}")
+        logger.error("AttributeError in is_bot_mentioned: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error in is_bot_mentioned: {e}")
+        logger.error("Unexpected error in is_bot_mentioned: %s", e)
         return False
 
 
@@ -391,21 +493,20 @@ def clean_message_text(message_text: str, bot_username: str) -> str:
     if not message_text or not bot_username:
         return message_text or ""
 
-    import re
-
-    # Create pattern to match @botname mentions
-    # This pattern handles:
-    # - @botname at the beginning
-    # - @botname in the middle
-    # - @botname at the end
-    # - Multiple @botname mentions
-    mention_pattern = rf"@{re.escape(bot_username)}"
+    # Pattern matching @botname mentions anywhere in the text (beginning,
+    # middle, end, or repeated); compiled once per bot username
+    mention_pattern = _MENTION_RE_CACHE.get(bot_username)
+    if mention_pattern is None:
+        mention_pattern = re.compile(rf"@{re.escape(bot_username)}", re.IGNORECASE)
+        _MENTION_RE_CACHE[bot_username] = mention_pattern
 
     # Remove all mentions of the bot
-    cleaned_text = re.sub(mention_pattern, "", message_text, flags=re.IGNORECASE)
+    cleaned_text, n_mentions = mention_pattern.subn("", message_text)
+    if not n_mentions:
+        return message_text.strip()
 
-    # Clean up extra whitespace
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+    # Clean up whitespace left behind by the removed mentions
+    cleaned_text = _WS_RE.sub(' ', cleaned_text).strip()
 
     return cleaned_text
 
@@ -435,19 +536,27 @@ async def log_group_interaction(update: Update, context: CallbackContext, intera
     Log group chat interactions for debugging and monitoring.
     """
     try:
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         chat_info = get_chat_info(update)
         if chat_info.get("chat_type") != "private":
-            logger.info(f"Group interaction - {interaction_type}: "
-                       f"Chat: {chat_info.get('chat_title', 'Unknown')} ({chat_info.get('chat_id')}), "
-                       f"User: {chat_info.get('username', 'Unknown')} ({chat_info.get('user_id')})")
+            logger.info("Group interaction - %s: Chat: %s (%s), User: %s (%s)",
+                        interaction_type,
+                        chat_info.get('chat_title', 'Unknown'), chat_info.get('chat_id'),
+                        chat_info.get('username', 'Unknown'), chat_info.get('user_id'))
     except Exception as e:
         logger.error(f"Error logging group interaction: {e}")
 
 
-async def validate_group_chat_setup(context: CallbackContext) -> bool:
+def validate_group_chat_setup(context: CallbackContext) -> bool:
     """
     Validate that the bot is properly configured for group chat interactions.
+    The bot identity is resolved once in post_init, so this is a constant-time check.
     """
+    if BOT_USERNAME:
+        return True
+
     try:
         if not context.bot:
             logger.error("Bot context is not available")
@@ -467,8 +576,8 @@ async def start_handle(update: Update, context: CallbackContext):
     await register_user_if_not_exists(update, context, update.message.from_user)
     user_id = update.message.from_user.id
 
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
-    db.start_new_dialog(user_id)
+    touch_last_interaction(user_id)
+    await run_db(db.start_new_dialog, user_id)
 
     reply_text = "Hi! I'm Michalis Jr🤖\n\n"
     reply_text += HELP_MESSAGE
@@ -480,14 +589,14 @@ async def start_handle(update: Update, context: CallbackContext):
 async def help_handle(update: Update, context: CallbackContext):
     await register_user_if_not_exists(update, context, update.message.from_user)
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
     await update.message.reply_text(HELP_MESSAGE, parse_mode=ParseMode.HTML)
 
 
 async def help_group_chat_handle(update: Update, context: CallbackContext):
      await register_user_if_not_exists(update, context, update.message.from_user)
      user_id = update.message.from_user.id
-     db.set_user_attribute(user_id, "last_interaction", datetime.now())
+     touch_last_interaction(user_id)
 
      text = HELP_GROUP_CHAT_MESSAGE.format(bot_username="@" + context.bot.username)
 
@@ -498,7 +607,7 @@ async def help_group_chat_handle(update: Update, context: CallbackContext):
 async def search_handle(update: Update, context: CallbackContext):
     await register_user_if_not_exists(update, context, update.message.from_user)
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
     if not context.args:
         await update.message.reply_text("❓ Usage: /search <query>")
@@ -508,7 +617,7 @@ async def search_handle(update: Update, context: CallbackContext):
 
     # In group chats, check if the bot is mentioned or the command is direct
     if update.message.chat.type != "private":
-        if not await is_bot_mentioned(update, context):
+        if not is_bot_mentioned(update, context):
             return
 
     await update.message.chat.send_action(action="typing")
@@ -541,11 +650,7 @@ async def search_handle(update: Update, context: CallbackContext):
     # Store search query and results in dialog history
     search_user_message = f"/search {query}"
     new_dialog_message = {"user": [{"type": "text", "text": search_user_message}], "bot": reply_text[:4000], "date": datetime.now()}
-    db.set_dialog_messages(
-        user_id,
-        db.get_dialog_messages(user_id, dialog_id=None) + [new_dialog_message],
-        dialog_id=None
-    )
+    await run_db(db.push_dialog_message, user_id, new_dialog_message, dialog_id=None)
 
 
 async def retry_handle(update: Update, context: CallbackContext):
@@ -553,15 +658,15 @@ async def retry_handle(update: Update, context: CallbackContext):
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
-    dialog_messages = db.get_dialog_messages(user_id, dialog_id=None)
+    dialog_messages = await run_db(db.get_dialog_messages, user_id, dialog_id=None)
     if len(dialog_messages) == 0:
         await update.message.reply_text("No message to retry 🤷‍♂️")
         return
 
     last_dialog_message = dialog_messages.pop()
-    db.set_dialog_messages(user_id, dialog_messages, dialog_id=None)  # last message was removed from the context
+    await run_db(db.set_dialog_messages, user_id, dialog_messages, dialog_id=None)  # last message was removed from the context
 
     await message_handle(update, context, message=last_dialog_message["user"], use_new_dialog_timeout=False)
 
@@ -583,12 +688,12 @@ async def unsupport_message_handle(update: Update, context: CallbackContext, mes
 async def message_handle(update: Update, context: CallbackContext, message=None, use_new_dialog_timeout=True):
     # validate group chat setup for non-private chats
     if update.message and update.message.chat.type != "private":
-        if not await validate_group_chat_setup(context):
+        if not validate_group_chat_setup(context):
             logger.error("Group chat setup validation failed")
             return
 
     # check if bot was mentioned (for group chats)
-    if not await is_bot_mentioned(update, context):
+    if not is_bot_mentioned(update, context):
         return
 
     # log group interactions for debugging
@@ -603,59 +708,37 @@ async def message_handle(update: Update, context: CallbackContext, message=None,
 
     # remove bot mention (in group chats) using enhanced cleaning
     if update.message.chat.type != "private":
-        _message = clean_message_text(_message, context.bot.username)
+        _message = clean_message_text(_message, BOT_USERNAME or context.bot.username)
 
     await register_user_if_not_exists(update, context, update.message.from_user)
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    chat_mode = db.get_user_attribute(user_id, "current_chat_mode")
+    user_attributes = await run_db(db.get_user_attributes, user_id, ["current_chat_mode", "current_model"])
+    chat_mode = user_attributes["current_chat_mode"]
 
     if chat_mode == "artist":
         await generate_image_handle(update, context, message=message)
         return
 
-    current_model = db.get_user_attribute(user_id, "current_model")
+    current_model = user_attributes["current_model"]
 
-    async def message_handle_fn():
+    async def message_handle_fn(placeholder_message):
         # new dialog timeout
         if use_new_dialog_timeout:
-            if (datetime.now() - db.get_user_attribute(user_id, "last_interaction")).seconds > config.new_dialog_timeout and len(db.get_dialog_messages(user_id)) > 0:
-                db.start_new_dialog(user_id)
+            last_interaction = await run_db(db.get_user_attribute, user_id, "last_interaction")
+            if isinstance(last_interaction, datetime):  # stored as datetime by older versions
+                last_interaction = last_interaction.timestamp()
+            if time.time() - last_interaction > config.new_dialog_timeout and len(await run_db(db.get_dialog_messages, user_id)) > 0:
+                await run_db(db.start_new_dialog, user_id)
                 await update.message.reply_text(f"Starting new dialog due to timeout (<b>{config.chat_modes[chat_mode]['name']}</b> mode) ✅", parse_mode=ParseMode.HTML)
-        db.set_user_attribute(user_id, "last_interaction", datetime.now())
+        touch_last_interaction(user_id)
 
         # in case of CancelledError
         n_input_tokens, n_output_tokens = 0, 0
 
         try:
-            # Check if message is empty
-            if _message is None or len(_message.strip()) == 0:
-                if update.message.chat.type == "private":
-                    await update.message.reply_text("🥲 You sent <b>empty message</b>. Please, try again!", parse_mode=ParseMode.HTML)
-                else:
-                    # In group chats, provide more helpful guidance
-                    await update.message.reply_text(
-                        f"👋 Hi! You mentioned me but didn't include a message. Try: <code>@{context.bot.username} your question here</code>",
-                        parse_mode=ParseMode.HTML
-                    )
-                return
-
-            # Use INDRA/Bedrock for ALL queries (not just health)
-            if not INDRA_AVAILABLE:
-                await update.message.reply_text(
-                    "❌ The bot is currently unavailable. AWS Bedrock integration is not initialized.",
-                    parse_mode=ParseMode.HTML
-                )
-                return
-
-            logger.info(f"Processing query from user {user_id}: {_message[:50]}...")
-
-            # send placeholder
-            placeholder_message = await update.message.reply_text("🤖 Thinking...")
-
-            # send typing action
-            await update.message.chat.send_action(action="typing")
+            logger.info("Processing query from user %s: %.50s...", user_id, _message)
 
             # Query INDRA system (works for both health and general queries)
             indra_result = await query_indra_health_system(user_id, _message)
@@ -664,22 +747,32 @@ async def message_handle(update: Update, context: CallbackContext, message=None,
                 # Use INDRA/Bedrock response
                 answer = indra_result['response']
 
-                # Update placeholder with result
-                try:
-                    await context.bot.edit_message_text(
-                        answer,
-                        chat_id=placeholder_message.chat_id,
-                        message_id=placeholder_message.message_id,
-                        parse_mode=ParseMode.HTML
-                    )
-                except telegram.error.BadRequest:
-                    # If message is too long or has formatting issues
-                    await context.bot.edit_message_text(
-                        answer[:4096],
-                        chat_id=placeholder_message.chat_id,
-                        message_id=placeholder_message.message_id,
-                        parse_mode=ParseMode.HTML
-                    )
+                # Update placeholder with the first chunk, send the rest as follow-ups
+                answer_chunks = list(split_html_into_chunks(answer, 4096))
+                for i, answer_chunk in enumerate(answer_chunks):
+                    try:
+                        if i == 0:
+                            await context.bot.edit_message_text(
+                                answer_chunk,
+                                chat_id=placeholder_message.chat_id,
+                                message_id=placeholder_message.message_id,
+                                parse_mode=ParseMode.HTML
+                            )
+                        else:
+                            await context.bot.send_message(placeholder_message.chat_id, answer_chunk, parse_mode=ParseMode.HTML)
+                    except telegram.error.BadRequest as e:
+                        if not str(e).startswith("Can't parse entities"):
+                            raise
+
+                        # invalid HTML in the answer, resend as plain text
+                        if i == 0:
+                            await context.bot.edit_message_text(
+                                answer_chunk,
+                                chat_id=placeholder_message.chat_id,
+                                message_id=placeholder_message.message_id
+                            )
+                        else:
+                            await context.bot.send_message(placeholder_message.chat_id, answer_chunk)
 
                 # Store in dialog history
                 new_dialog_message = {
@@ -688,11 +781,7 @@ async def message_handle(update: Update, context: CallbackContext, message=None,
                     "date": datetime.now(),
                     "source": "aws_bedrock"
                 }
-                db.set_dialog_messages(
-                    user_id,
-                    db.get_dialog_messages(user_id, dialog_id=None) + [new_dialog_message],
-                    dialog_id=None
-                )
+                await run_db(db.push_dialog_message, user_id, new_dialog_message, dialog_id=None)
 
                 # No token tracking for AWS Bedrock (tracked separately)
                 return
@@ -703,7 +792,7 @@ async def message_handle(update: Update, context: CallbackContext, message=None,
                 return
 
         except asyncio.CancelledError:
-            logger.info(f"Message handling cancelled for user {user_id}")
+            logger.info("Message handling cancelled for user %s", user_id)
             raise
 
         except Exception as e:
@@ -712,37 +801,59 @@ async def message_handle(update: Update, context: CallbackContext, message=None,
             await update.message.reply_text(error_text)
             return
 
-    async with user_semaphores[user_id]:
-        # Vision/photo support removed (was using OpenAI GPT-4 Vision)
-        if update.message.photo is not None and len(update.message.photo) > 0:
+    # Vision/photo support removed (was using OpenAI GPT-4 Vision)
+    if update.message.photo is not None and len(update.message.photo) > 0:
+        await update.message.reply_text(
+            "📸 Image analysis is currently disabled. Please describe the image in text.",
+            parse_mode=ParseMode.HTML
+        )
+        return
+
+    # Check if message is empty
+    if _message is None or len(_message.strip()) == 0:
+        if update.message.chat.type == "private":
+            await update.message.reply_text("🥲 You sent <b>empty message</b>. Please, try again!", parse_mode=ParseMode.HTML)
+        else:
+            # In group chats, provide more helpful guidance
             await update.message.reply_text(
-                "📸 Image analysis is currently disabled. Please describe the image in text.",
+                f"👋 Hi! You mentioned me but didn't include a message. Try: <code>@{context.bot.username} your question here</code>",
                 parse_mode=ParseMode.HTML
             )
-            return
+        return
+
+    # Use INDRA/Bedrock for ALL queries (not just health)
+    if not INDRA_AVAILABLE:
+        await update.message.reply_text(INDRA_UNAVAILABLE_MESSAGE, parse_mode=ParseMode.HTML)
+        return
 
+    # acknowledge right away; only the INDRA call and dialog writes are serialized per user
+    placeholder_message = await update.message.reply_text("🤖 Thinking...")
+    await update.message.chat.send_action(action="typing")
+
+    async with get_user_admission(user_id):
         task = asyncio.create_task(
-            message_handle_fn()
-        )            
+            message_handle_fn(placeholder_message)
+        )
 
         user_tasks[user_id] = task
+        task.add_done_callback(functools.partial(_pop_user_task, user_id))
 
         try:
             await task
         except asyncio.CancelledError:
             await update.message.reply_text("✅ Canceled", parse_mode=ParseMode.HTML)
-        else:
-            pass
-        finally:
-            if user_id in user_tasks:
-                del user_tasks[user_id]
 
 
-async def is_previous_message_not_answered_yet(update: Update, context: CallbackContext):
-    await register_user_if_not_exists(update, context, update.message.from_user)
+def _pop_user_task(user_id: int, task: asyncio.Task):
+    # only drop the entry if it still refers to this task
+    if user_tasks.get(user_id) is task:
+        del user_tasks[user_id]
 
+
+async def is_previous_message_not_answered_yet(update: Update, context: CallbackContext):
+    # callers have already run register_user_if_not_exists
     user_id = update.message.from_user.id
-    if user_semaphores[user_id].locked():
+    if get_user_admission(user_id).busy:
         text = "⏳ Please <b>wait</b> for a reply to the previous message\n"
         text += "Or you can /cancel it"
         await update.message.reply_text(text, reply_to_message_id=update.message.id, parse_mode=ParseMode.HTML)
@@ -754,12 +865,12 @@ async def is_previous_message_not_answered_yet(update: Update, context: Callback
 async def voice_message_handle(update: Update, context: CallbackContext):
     # validate group chat setup for non-private chats
     if update.message and update.message.chat.type != "private":
-        if not await validate_group_chat_setup(context):
+        if not validate_group_chat_setup(context):
             logger.error("Group chat setup validation failed for voice message")
             return
 
     # check if bot was mentioned (for group chats)
-    if not await is_bot_mentioned(update, context):
+    if not is_bot_mentioned(update, context):
         return
 
     # log group interactions for debugging
@@ -769,7 +880,7 @@ async def voice_message_handle(update: Update, context: CallbackContext):
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
     # Voice transcription disabled (OpenAI Whisper removed)
     await update.message.reply_text(
@@ -783,7 +894,7 @@ async def generate_image_handle(update: Update, context: CallbackContext, messag
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
     # Image generation disabled (OpenAI removed)
     await update.message.reply_text(
@@ -797,13 +908,18 @@ async def new_dialog_handle(update: Update, context: CallbackContext):
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
-    db.set_user_attribute(user_id, "current_model", config.models["available_text_models"][0])
 
-    db.start_new_dialog(user_id)
+    def reset_dialog():
+        with db.batch(user_id) as user_updates:
+            user_updates["last_interaction"] = time.time()
+            user_updates["current_model"] = config.models["available_text_models"][0]
+        db.start_new_dialog(user_id)
+
+    # wait for the write so the next message sees the new state
+    await run_db(reset_dialog)
     await update.message.reply_text("Starting new dialog ✅")
 
-    chat_mode = db.get_user_attribute(user_id, "current_chat_mode")
+    chat_mode = await run_db(db.get_user_attribute, user_id, "current_chat_mode")
     await update.message.reply_text(f"{config.chat_modes[chat_mode]['welcome_message']}", parse_mode=ParseMode.HTML)
 
 
@@ -811,7 +927,7 @@ async def cancel_handle(update: Update, context: CallbackContext):
     await register_user_if_not_exists(update, context, update.message.from_user)
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
     if user_id in user_tasks:
         task = user_tasks[user_id]
@@ -820,6 +936,8 @@ async def cancel_handle(update: Update, context: CallbackContext):
         await update.message.reply_text("<i>Nothing to cancel...</i>", parse_mode=ParseMode.HTML)
 
 
+# chat modes and models are static after startup, so rendered menus are reused
+@functools.lru_cache(maxsize=32)
 def get_chat_mode_menu(page_index: int):
     n_chat_modes_per_page = config.n_chat_modes_per_page
     text = f"Select <b>chat mode</b> ({len(config.chat_modes)} modes available):"
@@ -862,7 +980,7 @@ async def show_chat_modes_handle(update: Update, context: CallbackContext):
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
     text, reply_markup = get_chat_mode_menu(0)
     await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
@@ -873,7 +991,7 @@ async def show_chat_modes_callback_handle(update: Update, context: CallbackConte
      if await is_previous_message_not_answered_yet(update.callback_query, context): return
 
      user_id = update.callback_query.from_user.id
-     db.set_user_attribute(user_id, "last_interaction", datetime.now())
+     touch_last_interaction(user_id)
 
      query = update.callback_query
      await query.answer()
@@ -899,8 +1017,12 @@ async def set_chat_mode_handle(update: Update, context: CallbackContext):
 
     chat_mode = query.data.split("|")[1]
 
-    db.set_user_attribute(user_id, "current_chat_mode", chat_mode)
-    db.start_new_dialog(user_id)
+    def switch_chat_mode():
+        db.set_user_attribute(user_id, "current_chat_mode", chat_mode)
+        db.start_new_dialog(user_id)
+
+    # wait for the write so the next message sees the new state
+    await run_db(switch_chat_mode)
 
     await context.bot.send_message(
         update.callback_query.message.chat.id,
@@ -909,8 +1031,13 @@ async def set_chat_mode_handle(update: Update, context: CallbackContext):
     )
 
 
-def get_settings_menu(user_id: int):
-    current_model = db.get_user_attribute(user_id, "current_model")
+async def get_settings_menu(user_id: int):
+    current_model = await run_db(db.get_user_attribute, user_id, "current_model")
+    return _render_settings_menu(current_model)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_settings_menu(current_model: str):
     text = config.models["info"][current_model]["description"]
 
     text += "\n\n"
@@ -940,9 +1067,9 @@ async def settings_handle(update: Update, context: CallbackContext):
     if await is_previous_message_not_answered_yet(update, context): return
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
-    text, reply_markup = get_settings_menu(user_id)
+    text, reply_markup = await get_settings_menu(user_id)
     await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
 
@@ -954,10 +1081,15 @@ async def set_settings_handle(update: Update, context: CallbackContext):
     await query.answer()
 
     _, model_key = query.data.split("|")
-    db.set_user_attribute(user_id, "current_model", model_key)
-    db.start_new_dialog(user_id)
 
-    text, reply_markup = get_settings_menu(user_id)
+    def switch_model():
+        db.set_user_attribute(user_id, "current_model", model_key)
+        db.start_new_dialog(user_id)
+
+    # wait for the write so the next message sees the new state
+    await run_db(switch_model)
+
+    text, reply_markup = _render_settings_menu(model_key)
     try:
         await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
     except telegram.error.BadRequest as e:
@@ -965,46 +1097,38 @@ async def set_settings_handle(update: Update, context: CallbackContext):
             pass
 
 
+# per-token prices in $, resolved once from config.models
+_MODEL_TOKEN_PRICES = {
+    model_key: (info["price_per_1000_input_tokens"] / 1000, info["price_per_1000_output_tokens"] / 1000)
+    for model_key, info in config.models["info"].items()
+    if "price_per_1000_input_tokens" in info
+}
+
+
 async def show_balance_handle(update: Update, context: CallbackContext):
     await register_user_if_not_exists(update, context, update.message.from_user)
 
     user_id = update.message.from_user.id
-    db.set_user_attribute(user_id, "last_interaction", datetime.now())
+    touch_last_interaction(user_id)
 
     # count total usage statistics
     total_n_spent_dollars = 0
     total_n_used_tokens = 0
 
-    n_used_tokens_dict = db.get_user_attribute(user_id, "n_used_tokens")
-    n_generated_images = db.get_user_attribute(user_id, "n_generated_images")
-    n_transcribed_seconds = db.get_user_attribute(user_id, "n_transcribed_seconds")
+    n_used_tokens_dict = await run_db(db.get_user_attribute, user_id, "n_used_tokens")
 
     details_text = "🏷️ Details:\n"
-    for model_key in sorted(n_used_tokens_dict.keys()):
-        n_input_tokens, n_output_tokens = n_used_tokens_dict[model_key]["n_input_tokens"], n_used_tokens_dict[model_key]["n_output_tokens"]
+    for model_key, model_n_used_tokens in sorted(n_used_tokens_dict.items()):
+        n_input_tokens, n_output_tokens = model_n_used_tokens["n_input_tokens"], model_n_used_tokens["n_output_tokens"]
         total_n_used_tokens += n_input_tokens + n_output_tokens
 
-        n_input_spent_dollars = config.models["info"][model_key]["price_per_1000_input_tokens"] * (n_input_tokens / 1000)
-        n_output_spent_dollars = config.models["info"][model_key]["price_per_1000_output_tokens"] * (n_output_tokens / 1000)
+        input_price, output_price = _MODEL_TOKEN_PRICES[model_key]
+        n_input_spent_dollars = input_price * n_input_tokens
+        n_output_spent_dollars = output_price * n_output_tokens
         total_n_spent_dollars += n_input_spent_dollars + n_output_spent_dollars
 
         details_text += f"- {model_key}: <b>{n_input_spent_dollars + n_output_spent_dollars:.03f}$</b> / <b>{n_input_tokens + n_output_tokens} tokens</b>\n"
 
-    # image generation
-    image_generation_n_spent_dollars = config.models["info"]["dalle-2"]["price_per_1_image"] * n_generated_images
-    if n_generated_images != 0:
-        details_text += f"- DALL·E 2 (image generation): <b>{image_generation_n_spent_dollars:.03f}$</b> / <b>{n_generated_images} generated images</b>\n"
-
-    total_n_spent_dollars += image_generation_n_spent_dollars
-
-    # voice recognition
-    voice_recognition_n_spent_dollars = config.models["info"]["whisper"]["price_per_1_min"] * (n_transcribed_seconds / 60)
-    if n_transcribed_seconds != 0:
-        details_text += f"- Whisper (voice recognition): <b>{voice_recognition_n_spent_dollars:.03f}$</b> / <b>{n_transcribed_seconds:.01f} seconds</b>\n"
-
-    total_n_spent_dollars += voice_recognition_n_spent_dollars
-
-
     text = f"You spent <b>{total_n_spent_dollars:.03f}$</b>\n"
     text += f"You used <b>{total_n_used_tokens}</b> tokens\n\n"
     text += details_text
@@ -1018,9 +1142,30 @@ async def edited_message_handle(update: Update, context: CallbackContext):
         await update.edited_message.reply_text(text, parse_mode=ParseMode.HTML)
 
 
+# at most one formatted error report per chat per interval (seconds);
+# entries are kept oldest first so expired ones can be dropped from the front
+ERROR_REPORT_INTERVAL = 30
+_last_error_report: dict[int, float] = {}
+
+
 async def error_handle(update: Update, context: CallbackContext) -> None:
     logger.error(msg="Exception while handling an update:", exc_info=context.error)
 
+    chat = update.effective_chat if isinstance(update, Update) else None
+    if chat is not None:
+        now = time.monotonic()
+        if now - _last_error_report.get(chat.id, float("-inf")) < ERROR_REPORT_INTERVAL:
+            logger.error("Suppressed error report for chat %s (already reported in the last %ss)", chat.id, ERROR_REPORT_INTERVAL)
+            return
+
+        # forget chats whose last report is outside the interval
+        for chat_id, reported_at in list(_last_error_report.items()):
+            if now - reported_at < ERROR_REPORT_INTERVAL:
+                break
+            del _last_error_report[chat_id]
+        _last_error_report.pop(chat.id, None)
+        _last_error_report[chat.id] = now
+
     try:
         # collect error message
         tb_list = traceback.format_exception(None, context.error, context.error.__traceback__)
@@ -1043,26 +1188,76 @@ async def error_handle(update: Update, context: CallbackContext) -> None:
     except:
         await context.bot.send_message(update.effective_chat.id, "Some error in error handler")
 
+
+class AllowedUsers(filters.MessageFilter):
+    """Single allow-list filter: sender username or id, or group chat id."""
+
+    def __init__(self, usernames, user_ids, group_ids):
+        super().__init__(name="AllowedUsers")
+        self.usernames = frozenset(username.lstrip("@") for username in usernames)
+        self.user_ids = frozenset(user_ids)
+        self.group_ids = frozenset(group_ids)
+
+    def filter(self, message) -> bool:
+        user = message.from_user
+        if user is not None and (user.id in self.user_ids or user.username in self.usernames):
+            return True
+        return message.chat.id in self.group_ids
+
+
+_BOT_COMMANDS = (
+    BotCommand("/new", "Start new dialog"),
+    BotCommand("/mode", "Select chat mode"),
+    BotCommand("/retry", "Re-generate response for previous query"),
+    BotCommand("/search", "Search the web"),
+    BotCommand("/balance", "Show balance"),
+    BotCommand("/settings", "Show settings"),
+    BotCommand("/help", "Show help message"),
+)
+
+
 async def post_init(application: Application):
-    await application.bot.set_my_commands([
-        BotCommand("/new", "Start new dialog"),
-        BotCommand("/mode", "Select chat mode"),
-        BotCommand("/retry", "Re-generate response for previous query"),
-        BotCommand("/search", "Search the web"),
-        BotCommand("/balance", "Show balance"),
-        BotCommand("/settings", "Show settings"),
-        BotCommand("/help", "Show help message"),
-    ])
+    global BOT_USERNAME, BOT_ID
+    me = await application.bot.get_me()
+    BOT_USERNAME, BOT_ID = me.username, me.id
+
+    global last_interaction_task
+    last_interaction_task = asyncio.create_task(concurrency.last_interaction_worker(
+        last_interaction_queue,
+        functools.partial(run_db, db.set_last_interactions),
+        LAST_INTERACTION_FLUSH_INTERVAL
+    ))
+
+    await application.bot.set_my_commands(_BOT_COMMANDS)
+
+
+async def post_shutdown(application: Application):
+    if last_interaction_task is not None:
+        last_interaction_task.cancel()
+        try:
+            await last_interaction_task
+        except asyncio.CancelledError:
+            pass
+
+    # write whatever was still queued
+    concurrency.flush_last_interactions(last_interaction_queue, db.set_last_interactions)
 
 def run_bot() -> None:
     application = (
         ApplicationBuilder()
         .token(config.telegram_token)
         .concurrent_updates(True)
-        .rate_limiter(AIORateLimiter(max_retries=5))
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=30,
+            overall_time_period=1,
+            group_max_rate=20,
+            group_time_period=60,
+            max_retries=3
+        ))
         .http_version("1.1")
         .get_updates_http_version("1.1")
         .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
 
@@ -1073,7 +1268,7 @@ def run_bot() -> None:
         any_ids = [x for x in config.allowed_telegram_usernames if isinstance(x, int)]
         user_ids = [x for x in any_ids if x > 0]
         group_ids = [x for x in any_ids if x < 0]
-        user_filter = filters.User(username=usernames) | filters.User(user_id=user_ids) | filters.Chat(chat_id=group_ids)
+        user_filter = AllowedUsers(usernames, user_ids, group_ids)
 
     application.add_handler(CommandHandler("start", start_handle, filters=user_filter))
     application.add_handler(CommandHandler("help", help_handle, filters=user_filter))
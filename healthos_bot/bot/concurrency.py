@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class UserAdmission:
+    """Per-user admission slots with a count of requests currently admitted.
+
+    The number of slots is fixed when the user is first seen; config is read
+    once at startup, so there is nothing to resize at runtime. Releasing is
+    synchronous, so a task cancelled while leaving the slot cannot leave the
+    user locked out.
+    """
+
+    def __init__(self, max_parallel: int = 1):
+        self.n_active = 0
+        self._semaphore = asyncio.Semaphore(max_parallel)
+
+    @property
+    def busy(self) -> bool:
+        return self.n_active > 0
+
+    async def acquire(self):
+        await self._semaphore.acquire()
+        self.n_active += 1
+
+    def release(self):
+        self.n_active -= 1
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def get_user_admission(admissions: OrderedDict, user_id: int, max_users: int) -> UserAdmission:
+    admission = admissions.get(user_id)
+    if admission is None:
+        admission = admissions[user_id] = UserAdmission()
+    else:
+        admissions.move_to_end(user_id)
+
+    # evict least recently used users; a busy slot means work in flight, so keep it
+    if len(admissions) > max_users:
+        for stale_user_id in list(admissions):
+            if len(admissions) <= max_users:
+                break
+            if stale_user_id != user_id and not admissions[stale_user_id].busy:
+                del admissions[stale_user_id]
+
+    return admission
+
+
+def drain_last_interactions(queue: asyncio.Queue, pending: dict) -> dict:
+    while not queue.empty():
+        user_id, timestamp = queue.get_nowait()
+        pending[user_id] = timestamp
+    return pending
+
+
+async def last_interaction_worker(queue: asyncio.Queue, write, flush_interval: float):
+    """Write queued (user_id, timestamp) bumps in batches via ``await write(batch)``."""
+    loop = asyncio.get_running_loop()
+    while True:
+        user_id, timestamp = await queue.get()
+        pending = {user_id: timestamp}
+
+        # collect everything that arrives within the flush window, keeping the latest per user
+        deadline = loop.time() + flush_interval
+        while (timeout := deadline - loop.time()) > 0:
+            try:
+                user_id, timestamp = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending[user_id] = timestamp
+
+        try:
+            await write(drain_last_interactions(queue, pending))
+        except Exception as e:
+            logger.error("Failed to flush last_interaction for %d users: %s", len(pending), e)
+
+
+def flush_last_interactions(queue: asyncio.Queue, write_blocking):
+    """Write whatever is still queued (on shutdown, after the worker is stopped)."""
+    pending = drain_last_interactions(queue, {})
+    if pending:
+        write_blocking(pending)
@@ -22,6 +22,8 @@ enable_message_streaming = config_yaml.get("enable_message_streaming", True)
 return_n_generated_images = config_yaml.get("return_n_generated_images", 1)
 image_size = config_yaml.get("image_size", "512x512")
 n_chat_modes_per_page = config_yaml.get("n_chat_modes_per_page", 5)
+n_max_concurrent_indra_requests = config_yaml.get("n_max_concurrent_indra_requests", 50)
+n_max_user_semaphores = config_yaml.get("n_max_user_semaphores", 10000)
 mongodb_uri = f"mongodb://mongo:{config_env['MONGODB_PORT']}"
 
 # chat_modes
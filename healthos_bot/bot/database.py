@@ -1,12 +1,18 @@
 from typing import Optional, Any
+from contextlib import contextmanager
 
 import pymongo
 import uuid
+import time
 from datetime import datetime
 
 import config
 
 
+# bump when register_user_if_not_exists gains a new legacy-field migration
+USER_SCHEMA_VERSION = 1
+
+
 class Database:
     def __init__(self):
         self.client = pymongo.MongoClient(config.mongodb_uri)
@@ -40,7 +46,7 @@ class Database:
             "first_name": first_name,
             "last_name": last_name,
 
-            "last_interaction": datetime.now(),
+            "last_interaction": time.time(),
             "first_seen": datetime.now(),
 
             "current_dialog_id": None,
@@ -50,7 +56,9 @@ class Database:
             "n_used_tokens": {},
 
             "n_generated_images": 0,
-            "n_transcribed_seconds": 0.0  # voice message transcription
+            "n_transcribed_seconds": 0.0,  # voice message transcription
+
+            "schema_version": USER_SCHEMA_VERSION
         }
 
         if not self.check_if_user_exists(user_id):
@@ -59,13 +67,15 @@ class Database:
     def start_new_dialog(self, user_id: int):
         self.check_if_user_exists(user_id, raise_exception=True)
 
+        user_dict = self.user_collection.find_one({"_id": user_id}, {"current_chat_mode": 1, "current_model": 1})
+
         dialog_id = str(uuid.uuid4())
         dialog_dict = {
             "_id": dialog_id,
             "user_id": user_id,
-            "chat_mode": self.get_user_attribute(user_id, "current_chat_mode"),
+            "chat_mode": user_dict.get("current_chat_mode"),
             "start_time": datetime.now(),
-            "model": self.get_user_attribute(user_id, "current_model"),
+            "model": user_dict.get("current_model"),
             "messages": []
         }
 
@@ -80,6 +90,9 @@ class Database:
 
         return dialog_id
 
+    def get_user(self, user_id: int) -> Optional[dict]:
+        return self.user_collection.find_one({"_id": user_id})
+
     def get_user_attribute(self, user_id: int, key: str):
         self.check_if_user_exists(user_id, raise_exception=True)
         user_dict = self.user_collection.find_one({"_id": user_id})
@@ -89,10 +102,37 @@ class Database:
 
         return user_dict[key]
 
+    def get_user_attributes(self, user_id: int, keys: list) -> dict:
+        self.check_if_user_exists(user_id, raise_exception=True)
+        user_dict = self.user_collection.find_one({"_id": user_id}, {key: 1 for key in keys})
+
+        return {key: user_dict.get(key) for key in keys}
+
     def set_user_attribute(self, user_id: int, key: str, value: Any):
         self.check_if_user_exists(user_id, raise_exception=True)
         self.user_collection.update_one({"_id": user_id}, {"$set": {key: value}})
 
+    def set_user_attributes(self, user_id: int, attributes: dict):
+        self.check_if_user_exists(user_id, raise_exception=True)
+        self.user_collection.update_one({"_id": user_id}, {"$set": attributes})
+
+    def set_last_interactions(self, last_interactions: dict):
+        self.user_collection.bulk_write(
+            [
+                pymongo.UpdateOne({"_id": user_id}, {"$set": {"last_interaction": timestamp}})
+                for user_id, timestamp in last_interactions.items()
+            ],
+            ordered=False
+        )
+
+    @contextmanager
+    def batch(self, user_id: int):
+        attributes = {}
+        yield attributes
+
+        if attributes:
+            self.set_user_attributes(user_id, attributes)
+
     def update_n_used_tokens(self, user_id: int, model: str, n_input_tokens: int, n_output_tokens: int):
         n_used_tokens_dict = self.get_user_attribute(user_id, "n_used_tokens")
 
@@ -126,3 +166,14 @@ class Database:
             {"_id": dialog_id, "user_id": user_id},
             {"$set": {"messages": dialog_messages}}
         )
+
+    def push_dialog_message(self, user_id: int, dialog_message: dict, dialog_id: Optional[str] = None):
+        self.check_if_user_exists(user_id, raise_exception=True)
+
+        if dialog_id is None:
+            dialog_id = self.get_user_attribute(user_id, "current_dialog_id")
+
+        self.dialog_collection.update_one(
+            {"_id": dialog_id, "user_id": user_id},
+            {"$push": {"messages": dialog_message}}
+        )
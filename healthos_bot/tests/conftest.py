@@ -0,0 +1,7 @@
+"""Pytest configuration for the bot tests."""
+
+import sys
+from pathlib import Path
+
+# bot modules import each other as top-level modules (the bot runs from bot/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "bot"))
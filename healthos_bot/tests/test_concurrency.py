@@ -0,0 +1,193 @@
+"""Tests for per-user admission and background write helpers."""
+
+import asyncio
+import sys
+import types
+from collections import OrderedDict
+
+import pytest
+from concurrency import (
+    UserAdmission,
+    drain_last_interactions,
+    flush_last_interactions,
+    get_user_admission,
+    last_interaction_worker,
+)
+
+
+class FakeDatabase:
+    """Records set_last_interactions batches instead of writing to MongoDB."""
+
+    def __init__(self, fail_times: int = 0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    def set_last_interactions(self, last_interactions: dict):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("mongo down")
+        self.batches.append(dict(last_interactions))
+
+
+@pytest.mark.asyncio
+async def test_user_admission_serializes_and_reports_busy():
+    admission = UserAdmission()
+    assert not admission.busy
+
+    order = []
+
+    async def run(name):
+        async with admission:
+            order.append(f"{name} start")
+            await asyncio.sleep(0)
+            order.append(f"{name} end")
+
+    first = asyncio.create_task(run("a"))
+    await asyncio.sleep(0)
+    assert admission.busy
+
+    await asyncio.gather(first, run("b"))
+    assert order == ["a start", "a end", "b start", "b end"]
+    assert not admission.busy
+
+
+@pytest.mark.asyncio
+async def test_user_admission_released_when_cancelled():
+    admission = UserAdmission()
+
+    async def hold():
+        async with admission:
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert admission.busy
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not admission.busy
+
+    # the slot is free again for the same user
+    await asyncio.wait_for(admission.acquire(), timeout=1)
+    admission.release()
+
+
+@pytest.mark.asyncio
+async def test_get_user_admission_is_per_user():
+    admissions = OrderedDict()
+    first = get_user_admission(admissions, 1, max_users=10)
+
+    assert get_user_admission(admissions, 1, max_users=10) is first
+    assert get_user_admission(admissions, 2, max_users=10) is not first
+
+
+@pytest.mark.asyncio
+async def test_get_user_admission_evicts_least_recently_used_idle_users():
+    admissions = OrderedDict()
+    busy = get_user_admission(admissions, 1, max_users=2)
+    await busy.acquire()
+    get_user_admission(admissions, 2, max_users=2)
+    get_user_admission(admissions, 3, max_users=2)
+
+    # user 1 is the oldest but busy, so the idle user 2 is evicted instead
+    assert list(admissions) == [1, 3]
+
+    busy.release()
+    get_user_admission(admissions, 3, max_users=2)
+    get_user_admission(admissions, 4, max_users=2)
+    assert list(admissions) == [3, 4]
+
+
+def test_drain_last_interactions_keeps_latest_per_user():
+    queue = asyncio.Queue()
+    for item in [(1, 10.0), (2, 11.0), (1, 12.0)]:
+        queue.put_nowait(item)
+
+    assert drain_last_interactions(queue, {3: 9.0}) == {3: 9.0, 1: 12.0, 2: 11.0}
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_last_interaction_worker_batches_within_flush_window():
+    db = FakeDatabase()
+    queue = asyncio.Queue()
+
+    async def write(batch):
+        await asyncio.to_thread(db.set_last_interactions, batch)
+
+    worker = asyncio.create_task(last_interaction_worker(queue, write, flush_interval=0.05))
+    queue.put_nowait((1, 1.0))
+    await asyncio.sleep(0.01)
+    queue.put_nowait((2, 2.0))
+    queue.put_nowait((1, 3.0))
+    await asyncio.sleep(0.1)
+
+    # a bump after the flush starts a new batch
+    queue.put_nowait((2, 4.0))
+    await asyncio.sleep(0.1)
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+    assert db.batches == [{1: 3.0, 2: 2.0}, {2: 4.0}]
+
+
+@pytest.mark.asyncio
+async def test_last_interaction_worker_survives_write_errors():
+    db = FakeDatabase(fail_times=1)
+    queue = asyncio.Queue()
+
+    async def write(batch):
+        db.set_last_interactions(batch)
+
+    worker = asyncio.create_task(last_interaction_worker(queue, write, flush_interval=0.01))
+    queue.put_nowait((1, 1.0))
+    await asyncio.sleep(0.05)
+    queue.put_nowait((1, 2.0))
+    await asyncio.sleep(0.05)
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+    assert db.batches == [{1: 2.0}]
+
+
+def test_flush_last_interactions_on_shutdown():
+    db = FakeDatabase()
+    queue = asyncio.Queue()
+
+    # nothing queued, nothing written
+    flush_last_interactions(queue, db.set_last_interactions)
+    assert db.batches == []
+
+    queue.put_nowait((1, 1.0))
+    queue.put_nowait((1, 2.0))
+    flush_last_interactions(queue, db.set_last_interactions)
+    assert db.batches == [{1: 2.0}]
+    assert queue.empty()
+
+
+def test_database_set_last_interactions_bulk_updates(monkeypatch):
+    pymongo = pytest.importorskip("pymongo")
+    monkeypatch.setitem(sys.modules, "config", types.SimpleNamespace(mongodb_uri="mongodb://unused"))
+    monkeypatch.delitem(sys.modules, "database", raising=False)
+    import database
+
+    class FakeCollection:
+        def __init__(self):
+            self.calls = []
+
+        def bulk_write(self, requests, ordered=True):
+            self.calls.append((requests, ordered))
+
+    db = database.Database.__new__(database.Database)
+    db.user_collection = FakeCollection()
+    db.set_last_interactions({1: 10.0, 2: 20.0})
+
+    (requests, ordered), = db.user_collection.calls
+    assert not ordered
+    assert requests == [
+        pymongo.UpdateOne({"_id": 1}, {"$set": {"last_interaction": 10.0}}),
+        pymongo.UpdateOne({"_id": 2}, {"$set": {"last_interaction": 20.0}}),
+    ]
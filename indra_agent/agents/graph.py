@@ -1,8 +1,8 @@
 """LangGraph workflow for causal discovery system."""
 
+import asyncio
 import logging
 
-from langchain_aws import ChatBedrock
 from langgraph_supervisor import create_supervisor
 
 from indra_agent.agents.indra_query_agent import create_indra_query_agent
@@ -12,11 +12,35 @@ from indra_agent.agents.web_researcher import create_web_researcher_agent
 from indra_agent.config.agent_config import SUPERVISOR_CONFIG
 from indra_agent.config.settings import get_settings
 from indra_agent.utils.handoff_tools import create_agent_handoff_tools
+from indra_agent.utils.llm_factory import create_llm
 
 logger = logging.getLogger(__name__)
 
+# Compiled workflow shared by every client in the process (built on first use)
+_compiled_graph = None
+_compiled_graph_lock = asyncio.Lock()
+
 
 async def create_causal_discovery_graph():
+    """Return the compiled causal discovery workflow, building it on first call.
+
+    The compiled graph is stateless between invocations, so a single instance
+    is reused across requests instead of recreating the LLM clients, agents
+    and handoff tools each time.
+
+    Returns:
+        Compiled LangGraph workflow with supervisor and specialist agents
+    """
+    global _compiled_graph
+    if _compiled_graph is None:
+        # Concurrent first requests wait for a single build
+        async with _compiled_graph_lock:
+            if _compiled_graph is None:
+                _compiled_graph = await _build_causal_discovery_graph()
+    return _compiled_graph
+
+
+async def _build_causal_discovery_graph():
     """Create the LangGraph workflow for causal discovery using langgraph_supervisor.
 
     Returns:
@@ -27,11 +51,7 @@ async def create_causal_discovery_graph():
     settings = get_settings()
 
     # Initialize supervisor LLM
-    supervisor_llm = ChatBedrock(
-        model_id=settings.agent_model,
-        region_name=settings.aws_region,
-        model_kwargs={"temperature": SUPERVISOR_CONFIG.temperature},
-    )
+    supervisor_llm = create_llm(SUPERVISOR_CONFIG.temperature)
 
     # Create handoff tools for all enabled agents
     handoff_tools = create_agent_handoff_tools()
@@ -1,10 +1,9 @@
 """INDRA query agent for causal path discovery."""
 
-import json
 import logging
 from typing import Annotated, Any, Dict, List
 
-from langchain_aws import ChatBedrock
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
@@ -12,10 +11,11 @@ from langgraph.prebuilt import create_react_agent
 
 from indra_agent.agents.state import OverallState
 from indra_agent.config.agent_config import INDRA_QUERY_AGENT_CONFIG
-from indra_agent.config.settings import get_settings
+from indra_agent.core.path_columns import sum_evidence
 from indra_agent.services.graph_builder import GraphBuilderService
-from indra_agent.services.grounding_service import GroundingService
+from indra_agent.services.grounding_service import get_grounding_service
 from indra_agent.services.indra_service import INDRAService
+from indra_agent.utils.llm_factory import create_llm
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ def create_indra_tools():
         List of LangChain tools for INDRA operations
     """
     # Initialize services (shared across tool calls)
-    grounding_service = GroundingService()
+    grounding_service = get_grounding_service()
     indra_service = INDRAService()
     graph_builder = GraphBuilderService()
 
@@ -48,14 +48,14 @@ def create_indra_tools():
         """
         try:
             grounded = grounding_service.ground_entities(entities)
-            return json.dumps({
+            return orjson.dumps({
                 "status": "success",
                 "grounded_entities": grounded,
                 "count": len([e for e in grounded.values() if e])
-            })
+            }).decode()
         except Exception as e:
             logger.error(f"Entity grounding failed: {e}")
-            return json.dumps({"status": "error", "error": str(e)})
+            return orjson.dumps({"status": "error", "error": str(e)}).decode()
 
     @tool
     async def find_causal_paths(
@@ -82,25 +82,24 @@ def create_indra_tools():
                 target=target_entity,
                 max_depth=max_depth
             )
-            ranked = indra_service.rank_paths(paths)
+            ranked = indra_service.rank_paths(paths, k=10)  # Return top 10
 
-            return json.dumps({
+            return orjson.dumps({
                 "status": "success",
-                "num_paths": len(ranked),
-                "paths": ranked[:10],  # Return top 10
-                "total_evidence": sum(
-                    sum(e.get("evidence_count", 0) for e in p.get("edges", []))
-                    for p in ranked
-                )
-            })
+                "num_paths": len(paths),
+                "paths": ranked,
+                "total_evidence": sum_evidence(paths)
+            }).decode()
         except Exception as e:
             logger.error(f"Path finding failed: {e}")
-            return json.dumps({"status": "error", "error": str(e)})
+            return orjson.dumps({"status": "error", "error": str(e)}).decode()
 
     @tool
     async def build_causal_graph(
         paths_json: Annotated[str, "JSON string of ranked paths from find_causal_paths"],
-        genetics_json: Annotated[str, "JSON string of genetic context"] = "{}"
+        genetics_json: Annotated[str, "JSON string of genetic context"] = "{}",
+        source_entity: Annotated[str, "Source entity passed to find_causal_paths"] = "",
+        target_entity: Annotated[str, "Target entity passed to find_causal_paths"] = ""
     ) -> str:
         """Build a structured causal graph from INDRA paths.
 
@@ -110,29 +109,36 @@ def create_indra_tools():
         Args:
             paths_json: JSON string containing paths from find_causal_paths
             genetics_json: JSON string with genetic variants
+            source_entity: Source entity of the path query, if known
+            target_entity: Target entity of the path query, if known
 
         Returns:
             JSON string with causal graph structure
         """
         try:
-            paths = json.loads(paths_json).get("paths", [])
-            genetics = json.loads(genetics_json)
+            genetics = orjson.loads(genetics_json)
+            paths = orjson.loads(paths_json).get("paths", [])
 
-            # Build top 3 paths
-            causal_graph = graph_builder.build_causal_graph(
-                paths=paths[:3],
-                genetics=genetics
+            # Pre-cached pairs have a ready-built graph for the same top 3 paths
+            causal_graph = graph_builder.build_cached_graph(
+                source_entity, target_entity, paths, genetics
             )
+            if causal_graph is None:
+                # Build top 3 paths
+                causal_graph = graph_builder.build_causal_graph(
+                    paths=paths[:3],
+                    genetics=genetics
+                )
 
-            return json.dumps({
+            return orjson.dumps({
                 "status": "success",
                 "causal_graph": causal_graph.model_dump(),
                 "num_nodes": len(causal_graph.nodes),
                 "num_edges": len(causal_graph.edges)
-            })
+            }).decode()
         except Exception as e:
             logger.error(f"Graph building failed: {e}")
-            return json.dumps({"status": "error", "error": str(e)})
+            return orjson.dumps({"status": "error", "error": str(e)}).decode()
 
     return [ground_biological_entities, find_causal_paths, build_causal_graph]
 
@@ -146,15 +152,10 @@ async def create_indra_query_agent(handoff_tools=None):
     Returns:
         LangGraph ReAct agent configured for INDRA querying
     """
-    settings = get_settings()
     config = INDRA_QUERY_AGENT_CONFIG
 
     # Initialize LLM
-    llm = ChatBedrock(
-        model_id=settings.agent_model,
-        region_name=settings.aws_region,
-        model_kwargs={"temperature": config.temperature},
-    )
+    llm = create_llm(config.temperature)
 
     # Get INDRA-specific tools
     indra_tools = create_indra_tools()
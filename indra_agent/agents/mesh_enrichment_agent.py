@@ -9,13 +9,13 @@ import json
 import logging
 from typing import Annotated, List
 
-from langchain_aws import ChatBedrock
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
 
 from indra_agent.agents.state import OverallState
 from indra_agent.config.settings import get_settings
 from indra_agent.services.writer_kg_service import WriterKGService
+from indra_agent.utils.llm_factory import create_llm
 
 logger = logging.getLogger(__name__)
 
@@ -128,14 +128,8 @@ async def create_mesh_enrichment_agent(handoff_tools=None):
     Returns:
         LangGraph ReAct agent configured for MeSH enrichment
     """
-    settings = get_settings()
-
     # Initialize LLM
-    llm = ChatBedrock(
-        model_id=settings.agent_model,
-        region_name=settings.aws_region,
-        model_kwargs={"temperature": MESH_ENRICHMENT_CONFIG["temperature"]},
-    )
+    llm = create_llm(MESH_ENRICHMENT_CONFIG["temperature"])
 
     # Get MeSH-specific tools
     mesh_tools = create_mesh_tools()
@@ -4,7 +4,6 @@ import logging
 import time
 from typing import Dict, Literal
 
-from langchain_aws import ChatBedrock
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
@@ -12,7 +11,9 @@ from indra_agent.agents.state import OverallState
 from indra_agent.config.agent_config import SUPERVISOR_CONFIG
 from indra_agent.config.settings import get_settings
 from indra_agent.core.models import CausalGraph, Metadata
+from indra_agent.core.path_columns import sum_evidence
 from indra_agent.services.graph_builder import GraphBuilderService
+from indra_agent.utils.llm_factory import create_llm
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +25,12 @@ class SupervisorAgent:
         """Initialize supervisor agent."""
         self.settings = get_settings()
         self.config = SUPERVISOR_CONFIG
+        # The system prompt is static; build its message once
+        self.system_message = SystemMessage(content=self.config.system_prompt)
         self.graph_builder = GraphBuilderService()
 
         # Initialize LLM (AWS Bedrock)
-        self.llm = ChatBedrock(
-            model_id=self.settings.agent_model,
-            region_name=self.settings.aws_region,
-            model_kwargs={"temperature": self.config.temperature},
-        )
+        self.llm = create_llm(self.config.temperature)
 
         self.start_time = None
 
@@ -96,7 +95,7 @@ class SupervisorAgent:
 
         # Use LLM to determine routing
         messages = [
-            SystemMessage(content=self.config.system_prompt),
+            self.system_message,
             HumanMessage(content=f"""Analyze this causal discovery query and determine which specialist agent to route to first.
 
 Query: {query_text}
@@ -193,7 +192,7 @@ Respond with ONLY the agent name: 'web_researcher' or 'indra_query_agent'"""),
 
         # Use LLM to generate explanations
         messages = [
-            SystemMessage(content=self.config.system_prompt),
+            self.system_message,
             HumanMessage(content=f"""Generate 3-5 concise explanations (each <200 chars) for this causal discovery result.
 
 Query: {query_text}
@@ -233,10 +232,7 @@ Each explanation must be <200 characters."""),
         # Calculate metadata
         query_time_ms = int((time.time() - self.start_time) * 1000)
         indra_paths = state.get("indra_paths", [])
-        total_evidence = sum(
-            sum(edge.get("evidence_count", 0) for edge in path.get("edges", []))
-            for path in indra_paths
-        )
+        total_evidence = sum_evidence(indra_paths)
 
         metadata = Metadata(
             query_time_ms=query_time_ms,
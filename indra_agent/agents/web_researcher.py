@@ -8,14 +8,13 @@ import json
 import logging
 from typing import Annotated, List, Dict
 
-from langchain_aws import ChatBedrock
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
 
 from indra_agent.agents.state import OverallState
 from indra_agent.config.agent_config import WEB_RESEARCHER_CONFIG
-from indra_agent.config.settings import get_settings
 from indra_agent.services.web_data_service import WebDataService
+from indra_agent.utils.llm_factory import create_llm
 
 logger = logging.getLogger(__name__)
 
@@ -44,15 +43,15 @@ def create_web_researcher_tools():
         try:
             all_data = []
 
-            for loc in locations[:5]:  # Limit to 5 locations
-                logger.info(f"Fetching pollution data for: {loc}")
+            locations = locations[:5]  # Limit to 5 locations
+            logger.info(f"Fetching pollution data for: {locations}")
 
-                data = await web_service.get_air_quality(
-                    city=loc.get("city"),
-                    state=loc.get("state"),
-                    country=loc.get("country")
-                )
+            # Fetch all locations concurrently
+            results = await web_service.get_pollution_data_batch(
+                [loc.get("city", "") for loc in locations]
+            )
 
+            for loc, data in zip(locations, results):
                 if data:
                     all_data.append({
                         "location": loc,
@@ -139,14 +138,8 @@ async def create_web_researcher_agent(handoff_tools=None):
     Returns:
         LangGraph ReAct agent configured for web research
     """
-    settings = get_settings()
-
     # Initialize LLM
-    llm = ChatBedrock(
-        model_id=settings.agent_model,
-        region_name=settings.aws_region,
-        model_kwargs={"temperature": WEB_RESEARCHER_CONFIG.temperature},
-    )
+    llm = create_llm(WEB_RESEARCHER_CONFIG.temperature)
 
     # Get web researcher tools
     web_tools = create_web_researcher_tools()
@@ -2,7 +2,7 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from indra_agent.core.client import INDRAAgentClient
 from indra_agent.core.models import (
@@ -45,7 +45,7 @@ def get_client() -> INDRAAgentClient:
 )
 async def causal_discovery(
     request: CausalDiscoveryRequest,
-) -> CausalDiscoveryResponse | ErrorResponse:
+) -> Response:
     """Discover causal paths between environmental exposures and biomarkers.
 
     This endpoint receives health queries with user context, queries INDRA
@@ -56,7 +56,8 @@ async def causal_discovery(
         request: Causal discovery request
 
     Returns:
-        CausalDiscoveryResponse or ErrorResponse
+        CausalDiscoveryResponse or ErrorResponse, serialized to JSON directly
+        by pydantic-core (``response_model`` is kept for the OpenAPI schema)
     """
     logger.info(f"Received causal discovery request: {request.request_id}")
 
@@ -76,15 +77,15 @@ async def causal_discovery(
                 f"Request {request.request_id} failed: {response.error.code}"
             )
 
-        return response
-
     except Exception as e:
         logger.error(f"Unexpected error processing request: {e}", exc_info=True)
 
-        return ErrorResponse(
+        response = ErrorResponse(
             request_id=request.request_id,
             error={
                 "code": "INVALID_REQUEST",
                 "message": f"Unexpected error: {str(e)}",
             },
         )
+
+    return Response(content=response.model_dump_json(), media_type="application/json")
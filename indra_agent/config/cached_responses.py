@@ -4,7 +4,21 @@ These cached responses ensure the system works reliably during the hackathon
 demo, even if INDRA API is slow or unavailable.
 """
 
-from typing import Any, Dict, List
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert lists to tuples.
+
+    Dicts are copied but kept as dicts so cached paths stay JSON-serializable.
+    """
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _freeze(v) for k, v in value.items()}
+    return value
 
 # Pre-cached INDRA paths for key demo queries
 CACHED_INDRA_PATHS: Dict[str, List[Dict[str, Any]]] = {
@@ -212,8 +226,33 @@ GENETIC_MODIFIERS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# The literals above are only read; expose read-only views with tuple lists
+CACHED_INDRA_PATHS = MappingProxyType(_freeze(CACHED_INDRA_PATHS))
+
+# (source, target) -> paths, built once from the "<source>_to_<target>" keys above
+_CACHED_INDEX: Dict[Tuple[str, str], Tuple[Dict[str, Any], ...]] = {}
+for _key, _paths in CACHED_INDRA_PATHS.items():
+    _source, _target = _key.split("_to_", 1)
+    _CACHED_INDEX[(sys.intern(_source), sys.intern(_target))] = _paths
+del _key, _paths, _source, _target
+
+# Node name -> variants whose modifier affects it (inverse of "affected_nodes")
+_NODE_TO_MODIFIERS: Dict[str, Tuple[str, ...]] = {}
+for _variant, _info in GENETIC_MODIFIERS.items():
+    for _name in _info["affected_nodes"]:
+        _NODE_TO_MODIFIERS[_name] = _NODE_TO_MODIFIERS.get(_name, ()) + (_variant,)
+del _variant, _info, _name
+
+GENETIC_MODIFIERS = MappingProxyType(
+    {variant: MappingProxyType(_freeze(info)) for variant, info in GENETIC_MODIFIERS.items()}
+)
+
+# Shared immutable results for cache misses
+_EMPTY: Tuple[()] = ()
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
 
-def get_cached_path(source: str, target: str) -> List[Dict[str, Any]]:
+
+def get_cached_path(source: str, target: str) -> Sequence[Dict[str, Any]]:
     """Get cached INDRA path between source and target.
 
     Args:
@@ -221,19 +260,30 @@ def get_cached_path(source: str, target: str) -> List[Dict[str, Any]]:
         target: Target entity ID (e.g., "IL6")
 
     Returns:
-        List of cached paths, or empty list if not found
+        List of cached paths, or an empty sequence if not found
     """
-    key = f"{source}_to_{target}"
-    return CACHED_INDRA_PATHS.get(key, [])
+    return _CACHED_INDEX.get((source, target), _EMPTY)
 
 
-def get_genetic_modifier(variant: str) -> Dict[str, Any]:
+def get_genetic_modifier(variant: str) -> Mapping[str, Any]:
     """Get genetic modifier information.
 
     Args:
         variant: Genetic variant (e.g., "GSTM1_null")
 
     Returns:
-        Modifier info dict, or empty dict if not found
+        Read-only modifier info, or an empty mapping if not found
+    """
+    return GENETIC_MODIFIERS.get(variant, _EMPTY_MAPPING)
+
+
+def modifiers_for_node(name: str) -> Sequence[str]:
+    """Get the genetic variants whose modifier affects a node.
+
+    Args:
+        name: Node name (e.g., "oxidative_stress")
+
+    Returns:
+        Variant keys (e.g., ["GSTM1_null"]), or an empty sequence
     """
-    return GENETIC_MODIFIERS.get(variant, {})
+    return _NODE_TO_MODIFIERS.get(name, _EMPTY)
@@ -1,8 +1,10 @@
 """Application settings and configuration."""
 
 import os
+from functools import cached_property, lru_cache
 from typing import Optional
 
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,8 +19,12 @@ class Settings(BaseSettings):
     )
 
     # AWS Bedrock Credentials
-    aws_access_key_id: str
-    aws_secret_access_key: str
+    aws_access_key_id: str = Field(
+        validation_alias=AliasChoices("AWS_ACCESS_KEY_ID", "AWS_BEDROCK_ACCESS_KEY")
+    )
+    aws_secret_access_key: str = Field(
+        validation_alias=AliasChoices("AWS_SECRET_ACCESS_KEY", "AWS_BEDROCK_SECRET_KEY")
+    )
     aws_region: str = "us-east-1"
 
     # Optional API Keys
@@ -36,17 +42,18 @@ class Settings(BaseSettings):
     indra_base_url: str = "https://network.indra.bio"
     indra_timeout: int = 30
     indra_cache_ttl: int = 3600  # 1 hour
+    indra_path_cache_dir: Optional[str] = None  # Persistent path cache (needs diskcache)
 
     # Agent Settings (AWS Bedrock Model ID)
     agent_model: str = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
     agent_temperature: float = 0.0
 
-    @property
+    @cached_property
     def is_iqair_configured(self) -> bool:
         """Check if IQAir API key is configured."""
         return self.iqair_api_key is not None and len(self.iqair_api_key) > 0
 
-    @property
+    @cached_property
     def is_writer_configured(self) -> bool:
         """Check if Writer API key and graph ID are configured."""
         return (
@@ -57,20 +64,14 @@ class Settings(BaseSettings):
         )
 
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get or create settings instance.
 
     Returns:
         Settings: Application settings
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
 def reload_settings() -> Settings:
@@ -79,6 +80,9 @@ def reload_settings() -> Settings:
     Returns:
         Settings: Fresh settings instance
     """
-    global _settings
-    _settings = Settings()
-    return _settings
+    # Imported here: llm_factory depends on this module
+    from indra_agent.utils.llm_factory import invalidate_llm_cache
+
+    get_settings.cache_clear()
+    invalidate_llm_cache()
+    return get_settings()
@@ -6,7 +6,7 @@ agentic-system-spec.md.
 
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 
 class LocationHistory(BaseModel):
@@ -89,22 +89,6 @@ class Edge(BaseModel):
     )
     temporal_lag_hours: int = Field(ge=0, description="Hours from cause to effect")
 
-    @field_validator("effect_size")
-    @classmethod
-    def validate_effect_size(cls, v: float) -> float:
-        """Ensure effect_size is in valid range [0, 1]."""
-        if not 0 <= v <= 1:
-            raise ValueError(f"effect_size must be in [0, 1], got {v}")
-        return v
-
-    @field_validator("temporal_lag_hours")
-    @classmethod
-    def validate_temporal_lag(cls, v: int) -> int:
-        """Ensure temporal_lag_hours is non-negative."""
-        if v < 0:
-            raise ValueError(f"temporal_lag_hours must be >= 0, got {v}")
-        return v
-
 
 class GeneticModifier(BaseModel):
     """Genetic variant that modulates causal paths."""
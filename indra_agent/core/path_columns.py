@@ -0,0 +1,104 @@
+"""Columnar (structure-of-arrays) view of INDRA path edges.
+
+INDRA paths arrive as nested dicts (path -> edges -> fields). Aggregates over
+edges are computed on parallel arrays instead of walking the dicts.
+"""
+
+from itertools import chain
+from typing import Any, Dict, Iterable, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+
+class PathColumns(NamedTuple):
+    """Edges of a list of INDRA paths stored as parallel arrays.
+
+    Row ``i`` describes one edge; ``path_id[i]`` is the index of the path it
+    belongs to in the original list. Node names are stored as integer ids
+    into ``names``.
+    """
+
+    source_id: np.ndarray  # int32
+    target_id: np.ndarray  # int32
+    names: Tuple[str, ...]
+    evidence_count: np.ndarray  # int32
+    belief: np.ndarray  # float64
+    path_id: np.ndarray  # int32
+    n_paths: int
+
+    @property
+    def n_edges(self) -> int:
+        """Number of edges across all paths."""
+        return len(self.source_id)
+
+    @property
+    def sources(self) -> Tuple[str, ...]:
+        """Source node name of each edge."""
+        return tuple(self.names[i] for i in self.source_id)
+
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        """Target node name of each edge."""
+        return tuple(self.names[i] for i in self.target_id)
+
+    @property
+    def total_evidence(self) -> int:
+        """Sum of evidence counts over all edges."""
+        return int(self.evidence_count.sum())
+
+
+def sum_evidence(paths: Iterable[Dict[str, Any]]) -> int:
+    """Sum evidence counts over all edges of INDRA paths without building columns.
+
+    Args:
+        paths: INDRA paths as produced by INDRAService; a missing ``edges``
+            or ``evidence_count`` counts as none
+
+    Returns:
+        Total evidence count
+    """
+    return sum(
+        edge.get("evidence_count", 0)
+        for edge in chain.from_iterable(path.get("edges", ()) for path in paths)
+    )
+
+
+def build_path_columns(paths: Sequence[Dict[str, Any]]) -> PathColumns:
+    """Convert a list of INDRA path dicts into columnar form.
+
+    Args:
+        paths: INDRA paths, each with an ``edges`` list of edge dicts
+
+    Returns:
+        PathColumns with one row per edge
+    """
+    edges = [(i, edge) for i, path in enumerate(paths) for edge in path.get("edges", [])]
+    n_edges = len(edges)
+
+    # Node name -> id, assigned in first-seen order
+    ids: Dict[str, int] = {}
+    source_id = np.fromiter(
+        (ids.setdefault(edge.get("source"), len(ids)) for _, edge in edges),
+        dtype=np.int32,
+        count=n_edges,
+    )
+    target_id = np.fromiter(
+        (ids.setdefault(edge.get("target"), len(ids)) for _, edge in edges),
+        dtype=np.int32,
+        count=n_edges,
+    )
+
+    return PathColumns(
+        source_id=source_id,
+        target_id=target_id,
+        names=tuple(ids),
+        evidence_count=np.fromiter(
+            (edge.get("evidence_count") or 0 for _, edge in edges), dtype=np.int32, count=n_edges
+        ),
+        belief=np.fromiter(
+            (edge.get("belief") or 0.0 for _, edge in edges), dtype=np.float64, count=n_edges
+        ),
+        path_id=np.fromiter((i for i, _ in edges), dtype=np.int32, count=n_edges),
+        n_paths=len(paths),
+    )
+
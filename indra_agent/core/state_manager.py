@@ -4,16 +4,39 @@ Simplified version of DataManagerV2 focused on managing causal discovery state.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from indra_agent.core.models import CausalGraph
+from indra_agent.core.path_columns import PathColumns, build_path_columns
 
 logger = logging.getLogger(__name__)
 
+# Initial metadata values, copied into the instance's own dict
+_DEFAULT_METADATA: Dict[str, Any] = {
+    "paths_explored": 0,
+    "total_evidence": 0,
+}
+
 
 class StateManager:
     """Manages state for causal discovery workflow."""
 
+    __slots__ = (
+        "request_id",
+        "user_context",
+        "query",
+        "entities",
+        "source_entities",
+        "target_entities",
+        "indra_paths",
+        "indra_path_columns",
+        "_edge_index",
+        "environmental_data",
+        "causal_graph",
+        "explanations",
+        "metadata",
+    )
+
     def __init__(self):
         """Initialize state manager."""
         # Request context
@@ -28,6 +51,9 @@ class StateManager:
 
         # INDRA results
         self.indra_paths: List[Dict[str, Any]] = []
+        self.indra_path_columns: Optional[PathColumns] = None
+        # (source, target) -> indices of the paths containing that edge
+        self._edge_index: Dict[Tuple[str, str], List[int]] = {}
 
         # Environmental data
         self.environmental_data: Dict[str, Any] = {}
@@ -37,10 +63,7 @@ class StateManager:
         self.explanations: List[str] = []
 
         # Metadata
-        self.metadata: Dict[str, Any] = {
-            "paths_explored": 0,
-            "total_evidence": 0,
-        }
+        self.metadata: Dict[str, Any] = dict(_DEFAULT_METADATA)
 
     def set_request_context(
         self,
@@ -59,7 +82,7 @@ class StateManager:
         self.user_context = user_context
         self.query = query
 
-        logger.info(f"Request context set: {request_id}")
+        logger.info("Request context set: %s", request_id)
 
     def store_entities(
         self,
@@ -79,9 +102,10 @@ class StateManager:
         self.target_entities = target_entities or []
 
         logger.info(
-            f"Entities stored: {len(entities)} total, "
-            f"{len(self.source_entities)} sources, "
-            f"{len(self.target_entities)} targets"
+            "Entities stored: %d total, %d sources, %d targets",
+            len(entities),
+            len(self.source_entities),
+            len(self.target_entities),
         )
 
     def store_indra_paths(self, paths: List[Dict[str, Any]]):
@@ -90,17 +114,38 @@ class StateManager:
         Args:
             paths: List of causal paths from INDRA
         """
+        columns = build_path_columns(paths)
+
         self.indra_paths = paths
-        self.metadata["paths_explored"] = len(paths)
+        self.indra_path_columns = columns
 
-        # Count total evidence
-        total_evidence = 0
-        for path in paths:
+        # (source, target) -> indices of the paths using that edge, each listed once
+        edge_index: Dict[Tuple[str, str], List[int]] = {}
+        for path_idx, path in enumerate(paths):
             for edge in path.get("edges", []):
-                total_evidence += edge.get("evidence_count", 0)
+                path_ids = edge_index.setdefault((edge.get("source"), edge.get("target")), [])
+                if not path_ids or path_ids[-1] != path_idx:
+                    path_ids.append(path_idx)
+        self._edge_index = edge_index
+        self.metadata["paths_explored"] = columns.n_paths
+
+        # Aggregates are computed over the columnar arrays
+        total_evidence = columns.total_evidence
         self.metadata["total_evidence"] = total_evidence
 
-        logger.info(f"INDRA paths stored: {len(paths)} paths, {total_evidence} evidence papers")
+        logger.info("INDRA paths stored: %d paths, %d evidence papers", len(paths), total_evidence)
+
+    def get_paths_through(self, source: str, target: str) -> List[Dict[str, Any]]:
+        """Get stored INDRA paths that contain a given edge.
+
+        Args:
+            source: Edge source node
+            target: Edge target node
+
+        Returns:
+            Paths containing the edge, in stored order
+        """
+        return [self.indra_paths[i] for i in self._edge_index.get((source, target), ())]
 
     def store_environmental_data(self, data: Dict[str, Any]):
         """Store environmental data.
@@ -109,7 +154,9 @@ class StateManager:
             data: Environmental exposure data
         """
         self.environmental_data = data
-        logger.info(f"Environmental data stored for {data.get('current', {}).get('city', 'unknown')}")
+        logger.info(
+            "Environmental data stored for %s", data.get("current", {}).get("city", "unknown")
+        )
 
     def store_causal_graph(self, graph: CausalGraph):
         """Store final causal graph.
@@ -119,9 +166,10 @@ class StateManager:
         """
         self.causal_graph = graph
         logger.info(
-            f"Causal graph stored: {len(graph.nodes)} nodes, "
-            f"{len(graph.edges)} edges, "
-            f"{len(graph.genetic_modifiers)} genetic modifiers"
+            "Causal graph stored: %d nodes, %d edges, %d genetic modifiers",
+            len(graph.nodes),
+            len(graph.edges),
+            len(graph.genetic_modifiers),
         )
 
     def store_explanations(self, explanations: List[str]):
@@ -131,7 +179,7 @@ class StateManager:
             explanations: List of explanation strings
         """
         self.explanations = explanations
-        logger.info(f"Explanations stored: {len(explanations)} items")
+        logger.info("Explanations stored: %d items", len(explanations))
 
     def get_genetics(self) -> Dict[str, str]:
         """Get user genetics.
@@ -174,6 +222,26 @@ class StateManager:
         return self.causal_graph is not None
 
     def reset(self):
-        """Reset state for new request."""
-        self.__init__()
+        """Reset state for new request.
+
+        Containers set by the ``store_*`` methods may be the caller's own
+        objects, so they are rebound rather than cleared; the metadata dict is
+        owned by the manager and is reset in place.
+        """
+        self.request_id = None
+        self.user_context = {}
+        self.query = {}
+        self.entities = []
+        self.source_entities = []
+        self.target_entities = []
+        self.indra_paths = []
+        self.indra_path_columns = None
+        self._edge_index = {}
+        self.environmental_data = {}
+        self.causal_graph = None
+        self.explanations = []
+
+        self.metadata.clear()
+        self.metadata.update(_DEFAULT_METADATA)
+
         logger.info("State manager reset")
@@ -5,9 +5,16 @@ the API specification, including effect size calculation and temporal lag estima
 """
 
 import logging
-from typing import Any, Dict, List, Set
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from indra_agent.config.cached_responses import get_genetic_modifier
+import orjson
+
+from indra_agent.config.cached_responses import (
+    CACHED_INDRA_PATHS,
+    get_genetic_modifier,
+    modifiers_for_node,
+)
 from indra_agent.core.models import (
     CausalGraph,
     Edge,
@@ -19,6 +26,74 @@ from indra_agent.core.models import (
 
 logger = logging.getLogger(__name__)
 
+# Node IDs with a known node type
+_ENVIRONMENTAL_IDS = frozenset({"PM2.5", "PM10", "ozone", "NO2"})
+_PROCESS_IDS = frozenset({"oxidative_stress", "inflammation"})
+_BIOMARKER_IDS = frozenset({"CRP", "IL6", "8-OHdG"})
+
+
+@lru_cache(maxsize=1024)
+def _infer_node_type(node_id: str, database: str) -> str:
+    """Infer node type from ID and database.
+
+    Args:
+        node_id: Node identifier
+        database: Database (MESH, HGNC, GO, CHEBI)
+
+    Returns:
+        Node type (environmental, molecular, biomarker, genetic)
+    """
+    # Environmental exposures
+    if node_id in _ENVIRONMENTAL_IDS or database == "MESH":
+        return "environmental"
+
+    # Biological processes
+    if database == "GO" or node_id in _PROCESS_IDS:
+        return "molecular"
+
+    # Biomarkers (typical clinical markers)
+    if node_id in _BIOMARKER_IDS:
+        return "biomarker"
+
+    # Default to molecular
+    return "molecular"
+
+
+@lru_cache(maxsize=4096)
+def _grounding(database: str, identifier: str) -> Grounding:
+    """Get a shared (validated) Grounding for a database/identifier pair.
+
+    Hub nodes such as PM2.5 appear in many paths; their nodes share one
+    Grounding instance instead of each allocating and validating a copy.
+    """
+    return Grounding(database=database, identifier=identifier)
+
+
+@lru_cache(maxsize=1024)
+def _effect_size(belief: float, evidence_count: int) -> float:
+    """Calculate effect size from INDRA belief score.
+
+    Args:
+        belief: INDRA belief score (0-1)
+        evidence_count: Number of supporting papers
+
+    Returns:
+        Effect size in [0, 1] range
+    """
+    # Base effect from belief
+    effect = belief * 0.8
+
+    # Boost for high evidence
+    if evidence_count > 100:
+        effect += 0.15
+    elif evidence_count > 50:
+        effect += 0.10
+    elif evidence_count > 20:
+        effect += 0.05
+
+    # Cap at 0.95 (avoid determinism)
+    return min(effect, 0.95)
+
 
 class GraphBuilderService:
     """Service for building causal graphs from INDRA paths."""
@@ -38,19 +113,23 @@ class GraphBuilderService:
         self,
         paths: List[Dict[str, Any]],
         genetics: Dict[str, str],
+        trusted: bool = False,
     ) -> CausalGraph:
         """Build causal graph from INDRA paths.
 
         Args:
             paths: List of INDRA paths
             genetics: User genetic variants
+            trusted: Skip pydantic validation (only for developer-authored paths)
 
         Returns:
             CausalGraph with nodes, edges, and genetic modifiers
         """
         # Collect all unique nodes
         node_map: Dict[str, Node] = {}
-        edges: List[Edge] = []
+
+        # Unique edges as (evidence count, edge data), keeping the highest evidence
+        edge_map: Dict[tuple, Tuple[int, Dict[str, Any]]] = {}
 
         # Process each path
         for path in paths:
@@ -58,30 +137,75 @@ class GraphBuilderService:
             for node_data in path.get("nodes", []):
                 node_id = node_data["id"]
                 if node_id not in node_map:
-                    node_map[node_id] = self._create_node(node_data)
+                    node_map[node_id] = self._create_node(node_data, trusted)
 
-            # Add edges
+            # Deduplicate edges before any Edge objects are built
             for edge_data in path.get("edges", []):
-                edge = self._create_edge(edge_data)
-                edges.append(edge)
+                key = (
+                    edge_data.get("source", ""),
+                    edge_data.get("target", ""),
+                    edge_data.get("relationship", "activates"),
+                )
+                count = edge_data.get("evidence_count", 0)
+                current = edge_map.get(key)
+                if current is None or count > current[0]:
+                    edge_map[key] = (count, edge_data)
 
-        # Remove duplicate edges (keep highest evidence)
-        edges = self._deduplicate_edges(edges)
+        # Create edges
+        edges = [self._create_edge(edge_data, trusted) for _, edge_data in edge_map.values()]
 
         # Apply genetic modifiers
         genetic_modifiers = self._apply_genetic_modifiers(genetics, node_map)
 
-        return CausalGraph(
+        graph_cls = CausalGraph.model_construct if trusted else CausalGraph
+        return graph_cls(
             nodes=list(node_map.values()),
             edges=edges,
             genetic_modifiers=genetic_modifiers,
         )
 
-    def _create_node(self, node_data: Dict[str, Any]) -> Node:
+    def build_cached_graph(
+        self,
+        source: str,
+        target: str,
+        paths: List[Dict[str, Any]],
+        genetics: Dict[str, str],
+    ) -> Optional[CausalGraph]:
+        """Build causal graph for a pre-cached source/target pair.
+
+        The graph is pre-built at import from the top 3 cached paths; only the
+        genetic modifiers are computed per call.
+
+        Args:
+            source: Source entity name
+            target: Target entity name
+            paths: Paths the graph should be built from (top 3 are used)
+            genetics: User genetic variants
+
+        Returns:
+            CausalGraph (a private copy), or None if the pair is not pre-cached
+            or ``paths`` are not the cached ones
+        """
+        key = (source, target)
+        graph = _CACHED_GRAPHS.get(key)
+        if graph is None or orjson.dumps(paths[:3]) != _CACHED_GRAPH_PATHS[key]:
+            return None
+
+        if not genetics:
+            return graph.model_copy(deep=True)
+
+        node_map = {node.id: node for node in graph.nodes}
+        return graph.model_copy(
+            update={"genetic_modifiers": self._apply_genetic_modifiers(genetics, node_map)},
+            deep=True,
+        )
+
+    def _create_node(self, node_data: Dict[str, Any], trusted: bool = False) -> Node:
         """Create Node from INDRA node data.
 
         Args:
             node_data: Node data from INDRA
+            trusted: Skip pydantic validation
 
         Returns:
             Node instance
@@ -90,62 +214,42 @@ class GraphBuilderService:
         grounding_data = node_data.get("grounding", {})
 
         # Determine node type
-        node_type = self._infer_node_type(node_id, grounding_data.get("db", ""))
+        node_type = _infer_node_type(node_id, grounding_data.get("db", ""))
 
-        return Node(
+        node_cls = Node.model_construct if trusted else Node
+        return node_cls(
             id=node_id,
             type=node_type,
             label=node_data.get("name", node_id),
-            grounding=Grounding(
-                database=grounding_data.get("db", "UNKNOWN"),
-                identifier=grounding_data.get("id", ""),
+            grounding=_grounding(
+                grounding_data.get("db", "UNKNOWN"), grounding_data.get("id", "")
             ),
         )
 
     def _infer_node_type(self, node_id: str, database: str) -> str:
-        """Infer node type from ID and database.
+        """Infer node type from ID and database (see ``_infer_node_type``)."""
+        return _infer_node_type(node_id, database)
 
-        Args:
-            node_id: Node identifier
-            database: Database (MESH, HGNC, GO, CHEBI)
-
-        Returns:
-            Node type (environmental, molecular, biomarker, genetic)
-        """
-        # Environmental exposures
-        if node_id in ["PM2.5", "PM10", "ozone", "NO2"] or database == "MESH":
-            return "environmental"
-
-        # Biological processes
-        if database == "GO" or node_id in ["oxidative_stress", "inflammation"]:
-            return "molecular"
-
-        # Biomarkers (typical clinical markers)
-        if node_id in ["CRP", "IL6", "8-OHdG"]:
-            return "biomarker"
-
-        # Default to molecular
-        return "molecular"
-
-    def _create_edge(self, edge_data: Dict[str, Any]) -> Edge:
+    def _create_edge(self, edge_data: Dict[str, Any], trusted: bool = False) -> Edge:
         """Create Edge from INDRA edge data.
 
         Args:
             edge_data: Edge data from INDRA
+            trusted: Skip pydantic validation
 
         Returns:
             Edge instance
         """
         evidence_count = edge_data.get("evidence_count", 0)
         belief = edge_data.get("belief", 0.5)
-        pmids = edge_data.get("pmids", [])[:3]  # Limit to 3 PMIDs
+        pmids = list(edge_data.get("pmids", ())[:3])  # Limit to 3 PMIDs
 
         # Calculate effect size from INDRA belief
         effect_size = self._calculate_effect_size(belief, evidence_count)
 
         # Estimate temporal lag
         stmt_type = edge_data.get("statement_type", "Activation")
-        temporal_lag = self.TEMPORAL_LAG_MAP.get(stmt_type, self.TEMPORAL_LAG_MAP["default"])
+        temporal_lag = _LAG_GET(stmt_type, _LAG_DEFAULT)
 
         # Create evidence summary
         relationship = edge_data.get("relationship", "activates")
@@ -153,11 +257,14 @@ class GraphBuilderService:
         target = edge_data.get("target", "")
         summary = f"{source} {relationship} {target}"
 
-        return Edge(
+        edge_cls, evidence_cls = (
+            (Edge.model_construct, Evidence.model_construct) if trusted else (Edge, Evidence)
+        )
+        return edge_cls(
             source=source,
             target=target,
             relationship=relationship,
-            evidence=Evidence(
+            evidence=evidence_cls(
                 count=evidence_count,
                 confidence=belief,
                 sources=pmids,
@@ -168,7 +275,7 @@ class GraphBuilderService:
         )
 
     def _calculate_effect_size(self, belief: float, evidence_count: int) -> float:
-        """Calculate effect size from INDRA belief score.
+        """Calculate effect size from INDRA belief score (see ``_effect_size``).
 
         Args:
             belief: INDRA belief score (0-1)
@@ -177,39 +284,8 @@ class GraphBuilderService:
         Returns:
             Effect size in [0, 1] range
         """
-        # Base effect from belief
-        effect = belief * 0.8
-
-        # Boost for high evidence
-        if evidence_count > 100:
-            effect += 0.15
-        elif evidence_count > 50:
-            effect += 0.10
-        elif evidence_count > 20:
-            effect += 0.05
-
-        # Cap at 0.95 (avoid determinism)
-        return min(effect, 0.95)
-
-    def _deduplicate_edges(self, edges: List[Edge]) -> List[Edge]:
-        """Remove duplicate edges, keeping highest evidence.
-
-        Args:
-            edges: List of edges (may contain duplicates)
-
-        Returns:
-            Deduplicated list of edges
-        """
-        edge_map: Dict[tuple, Edge] = {}
-
-        for edge in edges:
-            key = (edge.source, edge.target, edge.relationship)
-
-            # Keep edge with highest evidence count
-            if key not in edge_map or edge.evidence.count > edge_map[key].evidence.count:
-                edge_map[key] = edge
-
-        return list(edge_map.values())
+        # Counts above 100 all get the same boost; clamp so they share cache entries
+        return _effect_size(belief, min(evidence_count, 101))
 
     def _apply_genetic_modifiers(
         self, genetics: Dict[str, str], node_map: Dict[str, Node]
@@ -224,30 +300,33 @@ class GraphBuilderService:
             List of genetic modifiers
         """
         modifiers = []
-        node_ids = set(node_map.keys())
+        if not genetics:
+            return modifiers
+
+        # Variants that affect at least one node in the graph
+        graph_variants = {
+            variant_key for node_id in node_map for variant_key in modifiers_for_node(node_id)
+        }
+
+        in_graph = node_map.__contains__
 
         for gene, variant in genetics.items():
             # Format as variant key
             variant_key = f"{gene}_{variant.replace('/', '')}"
-
-            # Get modifier info
-            modifier_info = get_genetic_modifier(variant_key)
-            if not modifier_info:
+            if variant_key not in graph_variants:
                 continue
 
-            # Check if any affected nodes are in graph
-            affected_nodes = modifier_info.get("affected_nodes", [])
-            present_nodes = [n for n in affected_nodes if n in node_ids]
-
-            if present_nodes:
-                modifiers.append(
-                    GeneticModifier(
-                        variant=variant_key,
-                        affected_nodes=present_nodes,
-                        effect_type=modifier_info["effect_type"],
-                        magnitude=modifier_info["magnitude"],
-                    )
+            # Affected nodes present in the graph, in the modifier's order
+            modifier_info = get_genetic_modifier(variant_key)
+            present_nodes = list(filter(in_graph, modifier_info["affected_nodes"]))
+            modifiers.append(
+                GeneticModifier(
+                    variant=variant_key,
+                    affected_nodes=present_nodes,
+                    effect_type=modifier_info["effect_type"],
+                    magnitude=modifier_info["magnitude"],
                 )
+            )
 
         return modifiers
 
@@ -285,8 +364,14 @@ class GraphBuilderService:
 
         # Causal mechanism
         if causal_graph.edges:
-            # Find highest evidence edge
-            top_edge = max(causal_graph.edges, key=lambda e: e.evidence.count)
+            # Find highest evidence edge (first one on ties, like max())
+            top_edge = None
+            top_count = -1
+            for edge in causal_graph.edges:
+                count = edge.evidence.count
+                if count > top_count:
+                    top_count = count
+                    top_edge = edge
             explanations.append(
                 f"{top_edge.source} {top_edge.relationship} {top_edge.target} "
                 f"({top_edge.evidence.count} papers, confidence: {top_edge.evidence.confidence:.2f})"
@@ -298,9 +383,8 @@ class GraphBuilderService:
             explanations.append(f"Causal chain: {' → '.join(node_names)}")
 
         # Expected outcome (if we have target biomarker)
-        biomarker_nodes = [n for n in causal_graph.nodes if n.type == "biomarker"]
-        if biomarker_nodes:
-            biomarker = biomarker_nodes[0]
+        biomarker = next((n for n in causal_graph.nodes if n.type == "biomarker"), None)
+        if biomarker is not None:
             explanations.append(
                 f"Expected impact on {biomarker.label} based on mechanistic evidence"
             )
@@ -310,3 +394,29 @@ class GraphBuilderService:
             explanations.append(f"Analysis based on {len(causal_graph.edges)} causal relationships")
 
         return explanations[:5]  # Max 5
+
+
+# Bound once so _create_edge does no attribute or "default" lookups per edge
+_LAG_GET = GraphBuilderService.TEMPORAL_LAG_MAP.get
+_LAG_DEFAULT = GraphBuilderService.TEMPORAL_LAG_MAP["default"]
+
+
+def _build_cached_graphs() -> Dict[Tuple[str, str], CausalGraph]:
+    """Build a graph (without genetic modifiers) for every pre-cached path set."""
+    builder = GraphBuilderService()
+    graphs = {}
+    for key, paths in CACHED_INDRA_PATHS.items():
+        source, target = key.split("_to_", 1)
+        graphs[(source, target)] = builder.build_causal_graph(paths[:3], {}, trusted=True)
+    return graphs
+
+
+# (source, target) -> graph built once from the trusted pre-cached paths
+_CACHED_GRAPHS: Dict[Tuple[str, str], CausalGraph] = _build_cached_graphs()
+
+# (source, target) -> serialized top 3 paths each pre-built graph came from
+_CACHED_GRAPH_PATHS: Dict[Tuple[str, str], bytes] = {
+    tuple(key.split("_to_", 1)): orjson.dumps(paths[:3])
+    for key, paths in CACHED_INDRA_PATHS.items()
+}
+
@@ -8,6 +8,7 @@ dynamic entity resolution and synonym expansion.
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -172,6 +173,14 @@ class GroundingService:
             **self.PROCESS_MAPPINGS,
         }
 
+        # Lowercase lookups built once; the first key wins, as in a linear scan
+        self._lower_index: Dict[str, Dict] = {}
+        for key, value in self.all_mappings.items():
+            self._lower_index.setdefault(key.lower(), value)
+        self._lower_names = [
+            (value["name"].lower(), value) for value in self.all_mappings.values()
+        ]
+
     def ground_entity(self, entity_name: str) -> Optional[Dict]:
         """Ground a single entity to database identifier.
 
@@ -187,13 +196,13 @@ class GroundingService:
 
         # Try case-insensitive match
         entity_lower = entity_name.lower()
-        for key, value in self.all_mappings.items():
-            if key.lower() == entity_lower:
-                return value
+        value = self._lower_index.get(entity_lower)
+        if value is not None:
+            return value
 
         # Try partial match on name
-        for key, value in self.all_mappings.items():
-            if entity_lower in value["name"].lower():
+        for name_lower, value in self._lower_names:
+            if entity_lower in name_lower:
                 return value
 
         return None
@@ -207,7 +216,12 @@ class GroundingService:
         Returns:
             Dict mapping entity names to grounding dicts
         """
-        return {name: self.ground_entity(name) for name in entity_names}
+        grounded: Dict[str, Optional[Dict]] = {}
+        for name in entity_names:
+            # Repeated names are grounded once
+            if name not in grounded:
+                grounded[name] = self.ground_entity(name)
+        return grounded
 
     def extract_entities_from_query(self, query_text: str) -> List[str]:
         """Extract known entities from query text.
@@ -368,3 +382,13 @@ class GroundingService:
                     logger.warning(f"No grounding found for: {entity}")
 
         return all_grounded
+
+
+@lru_cache(maxsize=1)
+def get_grounding_service() -> GroundingService:
+    """Get or create the shared grounding service.
+
+    Returns:
+        GroundingService: Grounding service with its lookup indexes built once
+    """
+    return GroundingService()
@@ -6,11 +6,14 @@ to cached responses for reliability.
 """
 
 import asyncio
+import heapq
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
 import httpx
+import orjson
 
 from indra_agent.config.cached_responses import get_cached_path
 from indra_agent.config.settings import get_settings
@@ -21,18 +24,49 @@ logger = logging.getLogger(__name__)
 class INDRAService:
     """Service for querying INDRA bio-ontology database."""
 
+    # Bound on the runtime path cache; entries also expire after INDRA_CACHE_TTL
+    PATH_CACHE_MAXSIZE = 512
+
     def __init__(self):
         """Initialize INDRA service."""
         self.settings = get_settings()
         self.base_url = self.settings.indra_base_url  # network.indra.bio
         self.timeout = self.settings.indra_timeout
-        self.cache: Dict[str, List[Dict]] = {}
+        # cache key -> (expiry time, paths)
+        self.cache: Dict[str, Tuple[float, List[Dict]]] = {}
         self.entity_cache: Dict[str, Dict] = {}  # Cache for entity resolution
+        # Live path queries in flight, so concurrent duplicates share one request
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.disk_cache = self._open_disk_cache(self.settings.indra_path_cache_dir)
         self.client = httpx.AsyncClient(timeout=self.timeout)
 
     async def close(self):
-        """Close HTTP client."""
+        """Close HTTP client and the persistent path cache."""
         await self.client.aclose()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    @staticmethod
+    def _open_disk_cache(directory: Optional[str]):
+        """Open the persistent path cache, if one is configured.
+
+        Args:
+            directory: Cache directory, or None to disable the disk cache
+
+        Returns:
+            diskcache.Cache, or None if disabled or diskcache is not installed
+        """
+        if not directory:
+            return None
+        try:
+            from diskcache import Cache
+        except ImportError:
+            logger.warning(
+                "INDRA_PATH_CACHE_DIR is set but diskcache is not installed; "
+                "persistent path cache disabled"
+            )
+            return None
+        return Cache(directory)
 
     async def health_check(self) -> bool:
         """Check if INDRA Network Search API is available.
@@ -281,23 +315,78 @@ class INDRAService:
         """
         # Check runtime cache first
         cache_key = f"{source}_{target}_{max_depth}"
-        if use_cache and cache_key in self.cache:
-            logger.info(f"Using cached path for {source} → {target}")
-            return self.cache[cache_key]
+        if use_cache:
+            entry = self.cache.get(cache_key)
+            if entry is not None and entry[0] > time.monotonic():
+                logger.info(f"Using cached path for {source} → {target}")
+                return entry[1]
 
         # Try pre-cached responses first
         cached = get_cached_path(source, target)
         if cached and use_cache:
             logger.info(f"Using pre-cached path for {source} → {target}")
-            self.cache[cache_key] = cached
+            self._cache_paths(cache_key, cached)
             return cached
 
-        # Query live INDRA Network Search API
+        if not use_cache:
+            return await self._search_and_cache(
+                source, target, max_depth, cache_key, use_disk_cache=False
+            )
+
+        # Join an identical live query that is already running
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._search_and_cache(source, target, max_depth, cache_key)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        # Shield so one cancelled caller does not cancel the query for the others
+        return await asyncio.shield(task)
+
+    async def _search_and_cache(
+        self,
+        source: str,
+        target: str,
+        max_depth: int,
+        cache_key: str,
+        use_disk_cache: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Query the live INDRA API and cache non-empty results.
+
+        Args:
+            source: Source entity name
+            target: Target entity name
+            max_depth: Maximum path depth (depth_limit parameter)
+            cache_key: Runtime cache key for this query
+            use_disk_cache: Whether to read and write the persistent path cache
+
+        Returns:
+            List of path dicts, or an empty list if none were found
+        """
+        disk_cache = self.disk_cache if use_disk_cache else None
+
+        # Results persisted by an earlier process (SQLite I/O kept off the event loop)
+        if disk_cache is not None:
+            stored = await asyncio.to_thread(disk_cache.get, cache_key)
+            if stored is not None:
+                logger.info(f"Using disk-cached path for {source} → {target}")
+                paths = orjson.loads(stored)
+                self._cache_paths(cache_key, paths)
+                return paths
+
         logger.info(f"Querying INDRA Network Search API: {source} → {target}")
         try:
             paths = await self._query_path_search(source, target, max_depth)
             if paths:
-                self.cache[cache_key] = paths
+                self._cache_paths(cache_key, paths)
+                if disk_cache is not None:
+                    await asyncio.to_thread(
+                        disk_cache.set,
+                        cache_key,
+                        orjson.dumps(paths),
+                        expire=self.settings.indra_cache_ttl,
+                    )
                 logger.info(f"Found {len(paths)} paths from {source} → {target}")
                 return paths
         except Exception as e:
@@ -307,6 +396,20 @@ class INDRAService:
         logger.warning(f"No paths found for {source} → {target}")
         return []
 
+    def _cache_paths(self, cache_key: str, paths: List[Dict[str, Any]]) -> None:
+        """Store paths in the runtime cache until INDRA_CACHE_TTL expires.
+
+        Args:
+            cache_key: Runtime cache key for the query
+            paths: Paths to cache
+        """
+        cache = self.cache
+        cache.pop(cache_key, None)
+        if len(cache) >= self.PATH_CACHE_MAXSIZE:
+            # Entries are kept in insertion order; drop the oldest
+            del cache[next(iter(cache))]
+        cache[cache_key] = (time.monotonic() + self.settings.indra_cache_ttl, paths)
+
     async def _query_path_search(
         self, source: str, target: str, max_depth: int
     ) -> List[Dict[str, Any]]:
@@ -491,11 +594,14 @@ class INDRAService:
         }
         return type_map.get(stmt_type, "activates")
 
-    def rank_paths(self, paths: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def rank_paths(
+        self, paths: List[Dict[str, Any]], k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """Rank paths by evidence and confidence.
 
         Args:
             paths: List of path dicts
+            k: Only return the best k paths (selected without a full sort)
 
         Returns:
             Sorted list of paths (best first)
@@ -519,5 +625,8 @@ class INDRAService:
             # Weighted combination
             return 0.4 * evidence_score + 0.3 * avg_belief + 0.3 * length_score
 
+        if k is not None:
+            return heapq.nlargest(k, paths, key=score_path)
+
         paths_sorted = sorted(paths, key=score_path, reverse=True)
         return paths_sorted
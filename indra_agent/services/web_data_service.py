@@ -4,15 +4,22 @@ This service fetches current air quality data from APIs (IQAir, etc.) or
 provides typical values for major cities.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
 from indra_agent.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Fold-change thresholds for describing an exposure change
+_FOLD_UP = 1.5
+_FOLD_DOWN = 0.67
+
 
 class WebDataService:
     """Service for fetching environmental and pollution data."""
@@ -35,11 +42,22 @@ class WebDataService:
         "Miami": 10.2,
         "Boston": 11.8,
     }
+    DEFAULT_PM25 = 15.0  # Default 15 µg/m³ for unknown cities
+
+    # Live readings change slowly; reuse them for a few minutes
+    POLLUTION_CACHE_TTL = 300.0  # seconds
+    POLLUTION_CACHE_MAXSIZE = 256
 
     def __init__(self):
         """Initialize web data service."""
         self.settings = get_settings()
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self._iqair_enabled = self.settings.is_iqair_configured
+        self._iqair_key = self.settings.iqair_api_key
+        # city -> (expiry time, IQAir data)
+        self._pollution_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.client = httpx.AsyncClient(
+            timeout=10.0, limits=httpx.Limits(max_keepalive_connections=20)
+        )
 
     async def close(self):
         """Close HTTP client."""
@@ -54,18 +72,61 @@ class WebDataService:
         Returns:
             Dict with PM2.5 and other pollution metrics
         """
-        # Try IQAir API if configured
-        if self.settings.is_iqair_configured:
-            try:
-                data = await self._fetch_iqair_data(city)
-                if data:
-                    return data
-            except Exception as e:
-                logger.warning(f"IQAir API failed: {e}")
+        if not self._iqair_enabled:
+            return self._get_typical_values(city)
+
+        # Check cache first
+        cached = self._pollution_cache.get(city)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        # Try IQAir API
+        try:
+            data = await self._fetch_iqair_data(city)
+            if data:
+                self._cache_pollution_data(city, data)
+                return data
+        except Exception as e:
+            logger.warning(f"IQAir API failed: {e}")
 
         # Fallback to typical values
         return self._get_typical_values(city)
 
+    async def get_pollution_data_batch(self, cities: List[str]) -> List[Dict[str, Any]]:
+        """Get current pollution data for several cities concurrently.
+
+        Args:
+            cities: City names
+
+        Returns:
+            Pollution data per city, in the same order; cities whose fetch
+            fails get typical values
+        """
+        if not self._iqair_enabled:
+            return [self._get_typical_values(city) for city in cities]
+
+        results = await asyncio.gather(
+            *(self.get_pollution_data(city) for city in cities), return_exceptions=True
+        )
+        return [
+            self._get_typical_values(city) if isinstance(result, Exception) else result
+            for city, result in zip(cities, results)
+        ]
+
+    def _cache_pollution_data(self, city: str, data: Dict[str, Any]) -> None:
+        """Store live pollution data for a city until the cache TTL expires.
+
+        Args:
+            city: City name
+            data: Pollution data from the API
+        """
+        cache = self._pollution_cache
+        cache.pop(city, None)
+        if len(cache) >= self.POLLUTION_CACHE_MAXSIZE:
+            # Entries are kept in insertion order; drop the oldest
+            del cache[next(iter(cache))]
+        cache[city] = (time.monotonic() + self.POLLUTION_CACHE_TTL, dict(data))
+
     async def _fetch_iqair_data(self, city: str) -> Optional[Dict[str, Any]]:
         """Fetch data from IQAir API.
 
@@ -81,13 +142,13 @@ class WebDataService:
                 "city": city,
                 "state": "",  # Would need state for US cities
                 "country": "USA",
-                "key": self.settings.iqair_api_key,
+                "key": self._iqair_key,
             }
 
             response = await self.client.get(url, params=params)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             pollution = data.get("data", {}).get("current", {}).get("pollution", {})
 
             pm25 = pollution.get("aqius", 0)  # AQI to PM2.5 approximation
@@ -114,7 +175,7 @@ class WebDataService:
         Returns:
             Dict with typical values
         """
-        pm25 = self.TYPICAL_PM25_VALUES.get(city, 15.0)  # Default 15 µg/m³
+        pm25 = _typical_pm25(city)
 
         return {
             "city": city,
@@ -135,19 +196,19 @@ class WebDataService:
         Returns:
             Dict with delta information
         """
-        old_pm25 = self.TYPICAL_PM25_VALUES.get(old_location, 15.0)
-        new_pm25 = self.TYPICAL_PM25_VALUES.get(new_location, 15.0)
+        old_pm25 = _typical_pm25(old_location)
+        new_pm25 = _typical_pm25(new_location)
 
         delta_absolute = new_pm25 - old_pm25
         delta_fold = new_pm25 / old_pm25 if old_pm25 > 0 else 1.0
 
         # Generate description
-        if delta_fold > 1.5:
+        if _FOLD_DOWN <= delta_fold <= _FOLD_UP:
+            description = f"remained similar after moving to {new_location}"
+        elif delta_fold > _FOLD_UP:
             description = f"increased {delta_fold:.1f}× after moving to {new_location}"
-        elif delta_fold < 0.67:
-            description = f"decreased to {1/delta_fold:.1f}× after moving to {new_location}"
         else:
-            description = f"remained similar after moving to {new_location}"
+            description = f"decreased to {1.0 / delta_fold:.1f}× after moving to {new_location}"
 
         return {
             "old_location": old_location,
@@ -176,7 +237,7 @@ class WebDataService:
         exposures = []
         for loc in location_history:
             city = loc.get("city", "")
-            pm25 = loc.get("avg_pm25") or self.TYPICAL_PM25_VALUES.get(city, 15.0)
+            pm25 = loc.get("avg_pm25") or _typical_pm25(city)
 
             exposures.append(
                 {
@@ -200,3 +261,23 @@ class WebDataService:
             "current": exposures[-1] if exposures else None,
             "delta": delta,
         }
+
+
+# Case-insensitive view of the typical values, built once
+_PM25_GET = {
+    city.casefold(): pm25 for city, pm25 in WebDataService.TYPICAL_PM25_VALUES.items()
+}.get
+
+
+def _typical_pm25(city: Optional[str]) -> float:
+    """Get the typical PM2.5 value for a city, ignoring case and surrounding spaces.
+
+    Args:
+        city: City name (None or empty gives the default)
+
+    Returns:
+        PM2.5 in µg/m³, or the default for unknown cities
+    """
+    if not city:
+        return WebDataService.DEFAULT_PM25
+    return _PM25_GET(city.strip().casefold(), WebDataService.DEFAULT_PM25)
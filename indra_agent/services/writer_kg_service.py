@@ -245,7 +245,7 @@ class WriterKGService:
                 terms = re.split(r',|\sand\s', match)
                 synonyms.extend([t.strip() for t in terms if t.strip()])
 
-        return list(set(synonyms))[:5]  # Dedupe and limit
+        return list(dict.fromkeys(synonyms))[:5]  # Dedupe (keeping order) and limit
 
     def _extract_related_terms(self, answer_text: str, relationship: str) -> List[str]:
         """Extract related terms by relationship type.
@@ -268,7 +268,7 @@ class WriterKGService:
             term_list = re.split(r',|\sand\s', match)
             terms.extend([t.strip() for t in term_list if t.strip()])
 
-        return list(set(terms))[:5]  # Dedupe and limit
+        return list(dict.fromkeys(terms))[:5]  # Dedupe (keeping order) and limit
 
     def _infer_relationship(self, source_term: str, target_term: str) -> str:
         """Infer relationship type between terms.
@@ -5,6 +5,7 @@ from indra_agent.utils.handoff_tools import (
     get_handoff_tool_names,
     validate_handoff_dependencies,
 )
+from indra_agent.utils.llm_factory import create_llm, invalidate_llm_cache
 from indra_agent.utils.logger import get_logger
 
 __all__ = [
@@ -12,4 +13,6 @@ __all__ = [
     "create_agent_handoff_tools",
     "get_handoff_tool_names",
     "validate_handoff_dependencies",
+    "create_llm",
+    "invalidate_llm_cache",
 ]
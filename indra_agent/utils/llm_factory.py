@@ -0,0 +1,89 @@
+"""Shared AWS Bedrock chat model instances."""
+
+import hashlib
+import importlib.util
+import logging
+import sys
+from functools import lru_cache
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+from indra_agent.config.settings import get_settings
+
+if TYPE_CHECKING:
+    from langchain_aws import ChatBedrock
+
+logger = logging.getLogger(__name__)
+
+
+def _lazy_import(name: str) -> ModuleType:
+    """Import a module whose body only runs on first attribute access.
+
+    Args:
+        name: Module name
+
+    Returns:
+        The module (already loaded, or a lazy placeholder)
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# boto3/botocore load when the first LLM is built, not at import
+langchain_aws = _lazy_import("langchain_aws")
+
+
+@lru_cache(maxsize=16)
+def _get_bedrock(model_id: str, region: str, temperature: float, key_hash: str) -> "ChatBedrock":
+    """Construct a ChatBedrock client (memoized per argument tuple).
+
+    Credentials come from the settings; ``key_hash`` only takes part in the
+    cache key, so rotated credentials get a fresh client without the key
+    itself appearing in the cache.
+    """
+    settings = get_settings()
+    logger.info("Creating Bedrock LLM: %s (%s, temperature=%s)", model_id, region, temperature)
+    return langchain_aws.ChatBedrock(
+        model_id=model_id,
+        region_name=region,
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        model_kwargs={"temperature": temperature},
+    )
+
+
+def create_llm(temperature: float) -> "ChatBedrock":
+    """Get the Bedrock chat model for the configured model and region.
+
+    Instances are shared between callers with the same settings, so the
+    underlying boto3 client is created once.
+
+    Args:
+        temperature: Sampling temperature
+
+    Returns:
+        ChatBedrock instance
+    """
+    settings = get_settings()
+    # Both parts, so rotating only the secret still gets a fresh client
+    credentials = f"{settings.aws_access_key_id}\0{settings.aws_secret_access_key}"
+    key_hash = hashlib.sha256(credentials.encode()).hexdigest()
+    return _get_bedrock(settings.agent_model, settings.aws_region, temperature, key_hash)
+
+
+def invalidate_llm_cache():
+    """Drop all cached LLM instances (e.g. after settings are reloaded)."""
+    _get_bedrock.cache_clear()
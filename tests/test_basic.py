@@ -3,14 +3,21 @@
 import pytest
 
 from indra_agent.config.cached_responses import get_cached_path, get_genetic_modifier
+from indra_agent.config.settings import get_settings
 from indra_agent.core.models import (
     CausalDiscoveryRequest,
     LocationHistory,
     Query,
     UserContext,
 )
+from indra_agent.core.path_columns import build_path_columns, sum_evidence
+from indra_agent.core.state_manager import StateManager
 from indra_agent.services.grounding_service import GroundingService
 from indra_agent.services.graph_builder import GraphBuilderService
+from indra_agent.services.indra_service import INDRAService
+from indra_agent.services.web_data_service import WebDataService, _typical_pm25
+from indra_agent.utils import llm_factory
+from indra_agent.utils.llm_factory import _lazy_import
 
 
 def test_grounding_service():
@@ -51,6 +58,25 @@ def test_cached_responses():
     assert edge["evidence_count"] > 100  # Well-studied relationship
 
 
+def test_cached_path_columns():
+    """Test columnar view of cached INDRA paths."""
+    paths = get_cached_path("PM2.5", "IL6")
+    columns = build_path_columns(paths)
+
+    assert columns.n_paths == len(paths)
+    assert columns.n_edges == sum(len(p["edges"]) for p in paths)
+    assert columns.total_evidence == sum(
+        e["evidence_count"] for p in paths for e in p["edges"]
+    )
+    assert columns.sources[0] == paths[0]["edges"][0]["source"]
+
+
+def test_sum_evidence_tolerates_missing_fields():
+    """Test evidence totals treat missing edges/counts as zero."""
+    paths = [{"edges": [{"evidence_count": 4}, {}]}, {}]
+    assert sum_evidence(paths) == 4
+
+
 def test_genetic_modifiers():
     """Test genetic modifier retrieval."""
     modifier = get_genetic_modifier("GSTM1_null")
@@ -59,6 +85,27 @@ def test_genetic_modifiers():
     assert "oxidative_stress" in modifier["affected_nodes"]
 
 
+def test_state_manager_paths_through_edge():
+    """Test edge lookup lists each path once and is rebuilt after reset."""
+    loop = {"source": "IL6", "target": "CRP"}
+    first = {"edges": [loop, {"source": "CRP", "target": "IL6"}, loop]}
+    second = {"edges": [{"source": "PM2.5", "target": "IL6"}, loop]}
+    state = StateManager()
+    state.store_indra_paths([first, second])
+
+    assert state.get_paths_through("IL6", "CRP") == [first, second]
+    assert state.get_paths_through("PM2.5", "IL6") == [second]
+    assert state.get_paths_through("CRP", "PM2.5") == []
+
+    state.reset()
+    assert state.get_paths_through("IL6", "CRP") == []
+
+    third = {"edges": [{"source": "PM2.5", "target": "CRP"}]}
+    state.store_indra_paths([third])
+    assert state.get_paths_through("PM2.5", "CRP") == [third]
+    assert state.get_paths_through("IL6", "CRP") == []
+
+
 def test_request_model_validation():
     """Test Pydantic request model validation."""
     request = CausalDiscoveryRequest(
@@ -111,3 +158,104 @@ def test_graph_builder_temporal_lag():
 
     # Default
     assert builder.TEMPORAL_LAG_MAP["default"] == 6
+
+
+async def test_indra_path_disk_cache(tmp_path):
+    """Test persistent path cache across service instances."""
+    pytest.importorskip("diskcache")
+    paths = [{"nodes": [], "edges": [{"evidence_count": 3}], "path_belief": 0.7}]
+    calls = []
+
+    async def fake_query(source, target, max_depth):
+        calls.append((source, target, max_depth))
+        return paths
+
+    first = INDRAService()
+    first.disk_cache = INDRAService._open_disk_cache(str(tmp_path))
+    first._query_path_search = fake_query
+    assert await first.find_causal_paths("FOO", "BAR") == paths
+    await first.close()
+
+    # A fresh service reads the stored result instead of querying INDRA
+    second = INDRAService()
+    second.disk_cache = INDRAService._open_disk_cache(str(tmp_path))
+    second._query_path_search = fake_query
+    assert await second.find_causal_paths("FOO", "BAR") == paths
+    assert len(calls) == 1
+
+    # use_cache=False bypasses the disk cache
+    assert await second.find_causal_paths("FOO", "BAR", use_cache=False) == paths
+    assert len(calls) == 2
+    await second.close()
+
+
+async def test_indra_runtime_cache_bounded(monkeypatch):
+    """Test runtime path cache entries expire and the cache size is bounded."""
+    calls = []
+
+    async def fake_query(source, target, max_depth):
+        calls.append(source)
+        return [{"nodes": [], "edges": [], "path_belief": 0.5}]
+
+    service = INDRAService()
+    service.disk_cache = None
+    service._query_path_search = fake_query
+    monkeypatch.setattr(service, "PATH_CACHE_MAXSIZE", 2)
+
+    for source in ("A", "B", "C"):
+        await service.find_causal_paths(source, "Z")
+    assert len(service.cache) == 2
+    await service.find_causal_paths("C", "Z")
+    assert calls == ["A", "B", "C"]
+
+    # Expired entries are queried again
+    monkeypatch.setattr(service.settings, "indra_cache_ttl", -1)
+    service.cache.clear()
+    await service.find_causal_paths("C", "Z")
+    await service.find_causal_paths("C", "Z")
+    assert calls == ["A", "B", "C", "C", "C"]
+    await service.close()
+
+
+def test_graph_builder_cached_graph():
+    """Test pre-built graphs are only used for the cached paths and not shared."""
+    builder = GraphBuilderService()
+    paths = list(get_cached_path("IL6", "CRP"))
+
+    graph = builder.build_cached_graph("IL6", "CRP", paths, {})
+    assert graph is not None
+    graph.nodes.clear()
+    assert builder.build_cached_graph("IL6", "CRP", paths, {}).nodes
+
+    # Different paths for a cached pair are built from scratch by the caller
+    assert builder.build_cached_graph("IL6", "CRP", paths[:0], {}) is None
+
+
+def test_typical_pm25_lookup():
+    """Test typical PM2.5 lookup is case-insensitive and tolerates missing cities."""
+    assert _typical_pm25(" los angeles ") == 34.5
+    assert _typical_pm25(None) == WebDataService.DEFAULT_PM25
+    assert _typical_pm25("") == WebDataService.DEFAULT_PM25
+    assert _typical_pm25("Atlantis") == WebDataService.DEFAULT_PM25
+
+
+def test_lazy_import_missing_module():
+    """Test lazy import of a missing module raises ModuleNotFoundError."""
+    with pytest.raises(ModuleNotFoundError):
+        _lazy_import("indra_agent_no_such_module")
+
+
+def test_create_llm_reused_until_credentials_rotate(monkeypatch):
+    """Test LLM instances are shared and rebuilt when the secret key changes."""
+    monkeypatch.setattr(
+        llm_factory, "langchain_aws", type("FakeAWS", (), {"ChatBedrock": dict})
+    )
+    llm_factory.invalidate_llm_cache()
+    try:
+        llm = llm_factory.create_llm(0.1)
+        assert llm_factory.create_llm(0.1) is llm
+
+        monkeypatch.setattr(get_settings(), "aws_secret_access_key", "rotated")
+        assert llm_factory.create_llm(0.1) is not llm
+    finally:
+        llm_factory.invalidate_llm_cache()